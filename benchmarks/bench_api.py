@@ -0,0 +1,175 @@
+"""
+Load test for the local API server (utils.api_server): requests per second and
+p50 / p99 latency per endpoint under concurrent keep-alive clients.
+
+    python -m benchmarks.bench_api [--threads 16] [--duration 5] [--latency 0.05]
+    python -m benchmarks.bench_api --url http://127.0.0.1:8780   # a running --serve
+
+Without --url, a server is started in-process with no network access: abilities
+come from a utils.http_replay upstream answering a synthetic recording after
+--latency seconds, matchups from a store filled with generated counter pages.
+That run starts with a cold burst, where every client asks for the same uncached
+champion at once, and reports how many upstream fetches it actually caused
+(1 if requests were coalesced). The steady-state mix runs after that.
+"""
+import argparse
+import http.client
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.bench_replay import write_synthetic_recording
+from benchmarks.bench_fuzzy_lookup import SSR_EXAMPLE
+from benchmarks.suite import example_champions, make_counter_page, SSR_KEY, SEED
+from utils import http_client
+from utils.parse_ugg_ssr import extract_json_from_html
+
+CHAMPIONS = ["Vi", "Gnar", "Ahri", "Jinx", "Leona", "MonkeyKing", "Kaisa", "Thresh"]
+QUERIES = ["vi", "gnarr", "ahri", "jinxx", "leona", "wukong", "kaisa", "thresh"]  # as typed, some misspelt
+ROLE = "top"
+
+
+def make_paths(champion_queries, rng: random.Random, count: int = 200) -> list[str]:
+    """ The request mix: mostly cooldowns, then name resolution, then matchups """
+    paths = []
+    for _ in range(count):
+        q = rng.choice(champion_queries)
+        paths.append(rng.choices(
+            [f"/cooldowns/{q}", f"/resolve?q={q}", f"/matchups/{q}/{ROLE}", f"/cooldowns/{q}?haste=60"],
+            weights=[5, 3, 2, 1],
+        )[0])
+    return paths
+
+
+def endpoint_of(path: str) -> str:
+    return "/" + path.lstrip("/").split("/")[0].split("?")[0]
+
+
+def run_clients(base_url: str, paths: list[str], threads: int, duration: float | None = None,
+                requests_each: int | None = None) -> dict[str, list[float]]:
+    """ `threads` keep-alive clients cycling through `paths`; latencies per endpoint plus non-200 count """
+    host, port = urlsplit(base_url).hostname, urlsplit(base_url).port
+    latencies, errors = {}, []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(threads)
+
+    def client(offset):
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        mine, failed = {}, 0
+        start_gate.wait()
+        deadline = time.perf_counter() + duration if duration else None
+        i = offset
+        while (deadline and time.perf_counter() < deadline) or (requests_each and i - offset < requests_each):
+            path = paths[i % len(paths)]
+            t0 = time.perf_counter()
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            mine.setdefault(endpoint_of(path), []).append(time.perf_counter() - t0)
+            failed += response.status != 200
+            i += 1
+        conn.close()
+        with lock:
+            for endpoint, values in mine.items():
+                latencies.setdefault(endpoint, []).extend(values)
+            errors.append(failed)
+
+    workers = [threading.Thread(target=client, args=(n * 7,)) for n in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    latencies["non-200"] = [sum(errors)]
+    return latencies
+
+
+def report(latencies: dict[str, list[float]], seconds: float):
+    non_200 = latencies.pop("non-200")[0]
+    total = sum(len(v) for v in latencies.values())
+    print(f"{total} requests in {seconds:.1f}s: {total / seconds:,.0f} req/s, {non_200} non-200")
+    print(f"  {'endpoint':<12} {'requests':>9} {'p50':>9} {'p99':>9}")
+    for endpoint, values in sorted(latencies.items()):
+        q = statistics.quantiles(values, n=100) if len(values) > 1 else values * 99
+        print(f"  {endpoint:<12} {len(values):>9} {q[49] * 1e3:>7.2f}ms {q[98] * 1e3:>7.2f}ms")
+
+
+def start_local_server(workdir: str, latency: float):
+    """ ApiServer on a replay upstream and a generated matchup store; returns (api server, replay server) """
+    from utils.api_server import ApiServer
+    from utils.abilities import get_champion_abilities
+    from utils.champion_registry import build_registry, register_registry
+    from utils.http_replay import ReplayServer, parse_rule
+    from utils.matchup_store import MatchupStore, register_matchup_store
+    from utils.parse_ugg_ssr import load_ssr
+    from utils.patch import pin_patch_metadata
+    from utils.session import LookupSession
+
+    with open(SSR_EXAMPLE, encoding="utf-8") as f:
+        patch, champion_data = example_champions(extract_json_from_html(f.read(), SSR_KEY))
+    registry = build_registry(patch, champion_data, None)
+    pin_patch_metadata([patch], {})
+    register_registry(registry)
+
+    rng = random.Random(SEED)
+    store = MatchupStore(patch)
+    opponents = [c.key for c in registry.champions]
+    for champ_id in CHAMPIONS:
+        key = registry.by_id(champ_id).key
+        store.ingest_ssr(load_ssr(make_counter_page(key, [o for o in opponents if o != key], rng)))
+    register_matchup_store(store)
+
+    recording = write_synthetic_recording(os.path.join(workdir, "recording"), CHAMPIONS)
+    upstream = ReplayServer(recording, [parse_rule(f"*:latency={latency}")] if latency else [], seed=SEED)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    http_client.set_upstream(upstream.url)
+
+    server = ApiServer(LookupSession(), get_champion_abilities, ("127.0.0.1", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, upstream
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="load-test this running server instead of an in-process one")
+    parser.add_argument("--threads", type=int, default=16, help="concurrent keep-alive clients (default 16)")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of steady-state load (default 5)")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="in-process upstream latency in seconds (default 0.05)")
+    args = parser.parse_args()
+    paths = make_paths(QUERIES, random.Random(SEED))
+
+    if args.url:
+        print(f"steady state: {args.threads} clients for {args.duration:g}s against {args.url}")
+        start = time.perf_counter()
+        latencies = run_clients(args.url, paths, args.threads, duration=args.duration)
+        report(latencies, time.perf_counter() - start)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # ability cache and friends go to a throwaway ./cache
+        server, upstream = start_local_server(workdir, args.latency)
+
+        print(f"cold burst: {args.threads} clients ask for /cooldowns/{QUERIES[0]} at once "
+              f"(upstream latency {args.latency * 1e3:.0f} ms)")
+        fetched = upstream.stats["served"]
+        start = time.perf_counter()
+        latencies = run_clients(server.url, [f"/cooldowns/{QUERIES[0]}"], args.threads, requests_each=1)
+        report(latencies, time.perf_counter() - start)
+        print(f"  upstream fetches: {upstream.stats['served'] - fetched}, cache: {server.cache.stats}\n")
+
+        print(f"steady state: {args.threads} clients for {args.duration:g}s, mixed endpoints")
+        start = time.perf_counter()
+        latencies = run_clients(server.url, paths, args.threads, duration=args.duration)
+        report(latencies, time.perf_counter() - start)
+        print(f"  cache: {server.cache.stats}, {len(server.cache)} responses held")
+
+        server.shutdown()
+        upstream.shutdown()
+
+
+if __name__ == "__main__":
+    main()
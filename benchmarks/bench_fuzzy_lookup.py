@@ -0,0 +1,105 @@
+"""
+Micro-benchmark: indexed fuzzy_dd_lookup vs the original linear scan.
+
+    python -m benchmarks.bench_fuzzy_lookup [--queries 2000] [--seed 7]
+
+The name map is built from the DDragon champion.json embedded in the checked-in
+u.gg page, so no network is needed. Queries are every champion name with
+deterministic typos (drops, swaps, substitutions, insertions) plus prefixes.
+"""
+import argparse
+import json
+import os
+import random
+import string
+import time
+
+from utils.dd_champ_names import (
+    build_ddragon_champion_map, ChampionNameIndex, linear_dd_lookup,
+)
+
+SSR_EXAMPLE = os.path.join(os.path.dirname(__file__), "..", "data_examples", "https___u.gg_lol_adc-tier-list.htm")
+
+
+def load_example_name_map() -> dict[str, str]:
+    html = open(SSR_EXAMPLE, encoding="utf-8").read()
+    start = html.find("{", html.find("window.__SSR_DATA__"))
+    ssr, _ = json.JSONDecoder().raw_decode(html, start)
+    champ_block = next(block for url, block in ssr.items() if url.endswith("en_US/champion.json"))
+    return build_ddragon_champion_map(champ_block["data"])
+
+
+def make_typo(word: str, rng: random.Random) -> str:
+    chars = list(word)
+    for _ in range(rng.randint(1, 2)):
+        if len(chars) < 3:
+            break
+        i = rng.randrange(len(chars))
+        op = rng.choice("dsri")
+        if op == "d":
+            del chars[i]
+        elif op == "s" and i + 1 < len(chars):
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+        elif op == "r":
+            chars[i] = rng.choice(string.ascii_lowercase)
+        else:
+            chars.insert(i, rng.choice(string.ascii_lowercase))
+    return "".join(chars)
+
+
+def make_queries(name_map: dict[str, str], count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    keys = list(name_map)
+    queries = []
+    while len(queries) < count:
+        key = rng.choice(keys)
+        kind = rng.random()
+        if kind < 0.7:
+            queries.append(make_typo(key, rng))
+        elif kind < 0.85:
+            queries.append(key[:rng.randint(2, max(2, len(key) - 1))])
+        else:
+            queries.append(key)
+    return queries
+
+
+def run(fn, queries) -> tuple[list, float]:
+    results = []
+    start = time.perf_counter()
+    for q in queries:
+        try:
+            results.append(fn(q))
+        except ValueError:
+            results.append(None)
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    name_map = load_example_name_map()
+    queries = make_queries(name_map, args.queries, args.seed)
+
+    start = time.perf_counter()
+    index = ChampionNameIndex(name_map)
+    build_s = time.perf_counter() - start
+
+    linear, linear_s = run(lambda q: linear_dd_lookup(q, name_map), queries)
+    indexed, indexed_s = run(index.lookup, queries)
+
+    mismatches = [(q, a, b) for q, a, b in zip(queries, linear, indexed) if a != b]
+    n = len(queries)
+    print(f"{len(name_map)} keys, {n} queries")
+    print(f"index build     : {build_s * 1e3:8.2f} ms (once per patch)")
+    print(f"linear scan     : {linear_s / n * 1e6:8.1f} us/query")
+    print(f"indexed lookup  : {indexed_s / n * 1e6:8.1f} us/query  ({linear_s / indexed_s:.1f}x)")
+    print(f"agreement       : {n - len(mismatches)}/{n}")
+    for q, a, b in mismatches[:10]:
+        print(f"  {q!r}: linear={a} indexed={b}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Fallback and end-to-end latency under injected network faults, reproducibly
+and without network access.
+
+    python -m benchmarks.bench_replay [--recording DIR] [--champions Vi Gnar Ahri]
+
+Starts a utils.http_replay server, points http_client at it and looks up each
+champion's abilities (cache off) under every scenario in SCENARIOS, once through
+get_champion_abilities (Meraki, then the CDragon fallback) and once through
+race_champion_sources (hedged). Prints which source answered and how long it took.
+
+Without --recording, a synthetic recording is generated: versions.json and the
+DDragon roster from the checked-in u.gg page, Meraki / DDragon / CDragon
+payloads for the chosen champions from the benchmark suite's generators.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.suite import example_champions, make_meraki_champion, make_cdragon_champion, SSR_KEY, SEED
+from benchmarks.bench_fuzzy_lookup import SSR_EXAMPLE
+from utils import http_client
+from utils.abilities import get_champion_abilities, race_champion_sources, fetch_latest_patch
+from utils.http_replay import Recording, ReplayServer, parse_rule
+from utils.parse_ugg_ssr import extract_json_from_html
+from utils.patch import PATCH_META_URL
+
+MERAKI_URL = "https://cdn.merakianalytics.com/riot/lol/resources/latest/en-US/champions/{id}.json"
+DDRAGON_URL = "https://ddragon.leagueoflegends.com/cdn/{patch}/data/en_US/champion/{id}.json"
+CDRAGON_URL = "https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/champions/{key}.json"
+
+SCENARIOS = {
+    "clean": [],
+    "wan (50ms, 1 MB/s)": ["*:latency=0.05,bandwidth=1m"],
+    "meraki 404": ["merakianalytics:status=404"],
+    "meraki 503": ["merakianalytics:status=503"],
+    "meraki slow (1.5s)": ["merakianalytics:latency=1.5"],
+    "meraki timeout": ["merakianalytics:timeout"],
+    "meraki down, cdragon flaky": ["merakianalytics:status=404", "communitydragon:status=503,p=0.5"],
+}
+
+
+def write_synthetic_recording(directory: str, champion_ids: list[str]) -> Recording:
+    with open(SSR_EXAMPLE, encoding="utf-8") as f:
+        ssr = extract_json_from_html(f.read(), SSR_KEY)
+    patch, champion_data = example_champions(ssr)
+    by_id = {info["id"]: info for info in champion_data.values()}
+    rng = random.Random(SEED)
+
+    recording = Recording(directory)
+    ok = {"Content-Type": "application/json"}
+    recording.add(PATCH_META_URL, 200, ok, json.dumps([patch, "15.9.1", "15.8.1"]).encode())
+    for champ_id in champion_ids:
+        info = by_id[champ_id]
+        dd, cd = make_cdragon_champion(rng)
+        dd = {**dd, "id": champ_id, "key": info["key"], "name": info["name"]}
+        recording.add(MERAKI_URL.format(id=champ_id), 200, ok, json.dumps(make_meraki_champion(rng)).encode())
+        recording.add(DDRAGON_URL.format(patch=patch, id=champ_id), 200, ok,
+                      json.dumps({"data": {champ_id: dd}}).encode())
+        recording.add(CDRAGON_URL.format(key=info["key"]), 200, ok, json.dumps(cd).encode())
+    return recording
+
+
+def run_scenario(champion_ids: list[str], patch: str) -> list[str]:
+    lines = []
+    for label, lookup in (("sequential", get_champion_abilities), ("hedged", race_champion_sources)):
+        times, sources = [], []
+        for champ_id in champion_ids:
+            start = time.perf_counter()
+            result = lookup(champ_id, patch, use_cache=False)
+            times.append(time.perf_counter() - start)
+            sources.append(result[1] if result[0] else "none")
+        lines.append(
+            f"  {label:<10} median {statistics.median(times) * 1e3:7.0f} ms, max {max(times) * 1e3:7.0f} ms"
+            f"  sources: {', '.join(dict.fromkeys(sources))}"
+        )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recording", help="recording directory (default: generate a synthetic one)")
+    parser.add_argument("--champions", nargs="+", default=["Vi", "Gnar", "Ahri"], help="DDragon ids to look up")
+    args = parser.parse_args()
+
+    recording_dir = os.path.abspath(args.recording) if args.recording else None
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # patch metadata cache goes to a throwaway ./cache
+        recording = Recording(recording_dir) if recording_dir else \
+            write_synthetic_recording(os.path.join(workdir, "recording"), args.champions)
+        server = ReplayServer(recording, seed=SEED)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        http_client.set_upstream(server.url)
+
+        patch = fetch_latest_patch()
+        print(f"{len(recording)} recorded responses on {server.url}, patch {patch}\n")
+        for name, rules in SCENARIOS.items():
+            server.rules = [parse_rule(r) for r in rules]
+            print(f"{name}" + (f"  [{'; '.join(rules)}]" if rules else ""))
+            for line in run_scenario(args.champions, patch):
+                print(line)
+        server.shutdown()
+        print(f"\nserver: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
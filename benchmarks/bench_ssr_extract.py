@@ -0,0 +1,73 @@
+"""
+Benchmark: SSR payload extraction from a u.gg page.
+
+    python -m benchmarks.bench_ssr_extract [--repeat 5]
+
+Compares the original per-character brace scan against the raw_decode based
+extract_json_from_html on the checked-in tier-list page, and checks both
+return the same object.
+Then times and measures peak allocations for reading a single block
+(en_US/champion.json) through a full decode vs a LazySSRDocument.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from utils.parse_ugg_ssr import (
+    extract_json_from_html, scan_json_from_html,
+    load_ssr, get_ssr_subdata,
+)
+
+SSR_EXAMPLE = os.path.join(os.path.dirname(__file__), "..", "data_examples", "https___u.gg_lol_adc-tier-list.htm")
+SSR_KEY = "window.__SSR_DATA__"
+
+
+def best_of(fn, repeat: int) -> tuple[object, float]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def peak_alloc(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = open(SSR_EXAMPLE, "rb").read()
+    html = raw.decode("utf-8")
+
+    reference, scan_s = best_of(lambda: scan_json_from_html(html, SSR_KEY), args.repeat)
+    fast, fast_s = best_of(lambda: extract_json_from_html(html, SSR_KEY), args.repeat)
+
+    print(f"page: {len(raw) / 1e6:.2f} MB, {len(reference)} SSR blocks")
+    print(f"char scan (old) : {scan_s * 1e3:8.1f} ms")
+    print(f"raw_decode      : {fast_s * 1e3:8.1f} ms  ({scan_s / fast_s:.1f}x)")
+    print(f"identical output: {reference == fast}")
+
+    block = "en_US/champion.json"
+    full_fn = lambda: get_ssr_subdata(extract_json_from_html(html, SSR_KEY), block)
+    lazy_fn = lambda: get_ssr_subdata(load_ssr(html, SSR_KEY), block)
+    full_block, full_s = best_of(full_fn, args.repeat)
+    lazy_block, lazy_s = best_of(lazy_fn, args.repeat)
+    print(f"\none block ({block}):")
+    print(f"full decode     : {full_s * 1e3:8.1f} ms, peak {peak_alloc(full_fn) / 1e6:6.1f} MB")
+    print(f"lazy document   : {lazy_s * 1e3:8.1f} ms, peak {peak_alloc(lazy_fn) / 1e6:6.1f} MB  ({full_s / lazy_s:.1f}x)")
+    print(f"identical block : {full_block == lazy_block}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Startup benchmark: time-to-prompt and time-to-first-table of the entry script
+(and of the PyInstaller build, when there is one).
+
+    python -m benchmarks.bench_startup [--runs 5] [--exe dist/fuzzy_cooldown_info_helper] [--budget-scale 1.0]
+
+Each run starts a fresh process in a temporary directory (so no ./cache is
+shared between runs) with --offline pointed at a fixture snapshot built from
+the checked-in u.gg page, so nothing touches the network:
+
+  prompt – process start until "Enemy champion(s)" is printed
+  table  – process start until the first cooldown table is on screen
+           (one query is typed as soon as the prompt appears)
+
+Medians are compared against BUDGETS; the exit status is 1 when any of them is
+over budget, so this can gate a build.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+
+from benchmarks.bench_fuzzy_lookup import SSR_EXAMPLE
+from utils.champion_registry import build_registry
+from utils.matchup_store import MatchupStore
+from utils.snapshot import SNAPSHOT_FORMAT
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPT = os.path.join(ROOT, "fuzzy_cooldown_info_helper.py")
+DEFAULT_EXE = os.path.join(ROOT, "dist", "fuzzy_cooldown_info_helper" + (".exe" if os.name == "nt" else ""))
+
+PROMPT_MARK = b"Enemy champion(s)"
+TABLE_MARK = b"Cease and Desist"  # last row of the fixture's table
+QUERY = "vi"
+QUERY_ID = "Vi"  # what QUERY resolves to, the ability cache key
+TIMEOUT = 30.0
+
+# median seconds; the frozen exe unpacks itself first, so it gets more room
+BUDGETS = {
+    "script": {"prompt": 0.25, "table": 0.4},
+    "exe": {"prompt": 2.0, "table": 2.5},
+}
+
+FIXTURE_ABILITIES = [
+    {"source": "Meraki", "key": "Q", "name": "Vault Breaker", "cooldowns": [12, 10.5, 9, 7.5, 6], "recharge": []},
+    {"source": "Meraki", "key": "W", "name": "Denting Blows", "cooldowns": [], "recharge": []},
+    {"source": "Meraki", "key": "E", "name": "Relentless Force", "cooldowns": [1, 1, 1, 1, 1], "recharge": [12, 10.5, 9, 7.5, 6]},
+    {"source": "Meraki", "key": "R", "name": "Cease and Desist", "cooldowns": [110, 85, 60], "recharge": []},
+]
+
+
+def write_fixture_snapshot(path: str) -> str:
+    """ A minimal offline snapshot: versions + registry from the example page, abilities for QUERY """
+    html = open(SSR_EXAMPLE, encoding="utf-8").read()
+    start = html.find("{", html.find("window.__SSR_DATA__"))
+    ssr, _ = json.JSONDecoder().raw_decode(html, start)
+    versions = next(block["data"] for url, block in ssr.items() if url.endswith("prod/versions.json"))
+    champion_data = next(block["data"] for url, block in ssr.items() if url.endswith("en_US/champion.json"))
+    patch = versions[0]
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("manifest.json", json.dumps({
+            "format": SNAPSHOT_FORMAT,
+            "latest_patch": patch,
+            "effective_patch": patch,
+            "created_at": time.time(),
+        }))
+        zf.writestr("patch.json", json.dumps({"versions": versions, "release_dates": {}}))
+        zf.writestr(f"registry/{patch}.json", json.dumps(build_registry(patch, champion_data, None).to_json()))
+        zf.writestr("abilities.json", json.dumps({
+            QUERY_ID: {"source": "Meraki Analytics (Wiki)", "rows": FIXTURE_ABILITIES, "last_used": time.time()},
+        }))
+        zf.writestr("matchups.bin", MatchupStore(patch).to_bytes())
+    return path
+
+
+class OutputWatcher:
+    """ Collects a child's stdout on a thread and records when each marker first shows up """
+
+    def __init__(self, stream, start: float, marks: tuple[bytes, ...]):
+        self.start = start
+        self.marks = marks
+        self.buffer = b""
+        self.seen = {}
+        self._cond = threading.Condition()
+        threading.Thread(target=self._pump, args=(stream,), daemon=True).start()
+
+    def _pump(self, stream):
+        while True:
+            chunk = stream.read1(65536) if hasattr(stream, "read1") else stream.read(1)
+            with self._cond:
+                if chunk:
+                    self.buffer += chunk
+                    now = time.perf_counter() - self.start
+                    for mark in self.marks:
+                        if mark not in self.seen and mark in self.buffer:
+                            self.seen[mark] = now
+                self._cond.notify_all()
+            if not chunk:
+                return
+
+    def wait_for(self, mark: bytes, timeout: float = TIMEOUT) -> float:
+        with self._cond:
+            if not self._cond.wait_for(lambda: mark in self.seen, timeout):
+                tail = self.buffer[-500:].decode("utf-8", "replace")
+                raise TimeoutError(f"{mark.decode()!r} not printed within {timeout}s; output tail:\n{tail}")
+            return self.seen[mark]
+
+
+def run_once(command: list[str], workdir: str) -> dict[str, float]:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=workdir, env=env,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    try:
+        watcher = OutputWatcher(proc.stdout, start, (PROMPT_MARK, TABLE_MARK))
+        prompt = watcher.wait_for(PROMPT_MARK)
+        proc.stdin.write(QUERY.encode() + b"\n")
+        proc.stdin.flush()
+        table = watcher.wait_for(TABLE_MARK)
+        return {"prompt": prompt, "table": table}
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def bench(name: str, command: list[str], snapshot: str, runs: int) -> dict[str, float]:
+    samples = {"prompt": [], "table": []}
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            result = run_once(command + ["--offline", snapshot], workdir)
+        for stage, seconds in result.items():
+            samples[stage].append(seconds)
+    medians = {stage: statistics.median(values) for stage, values in samples.items()}
+    print(f"{name}: " + ", ".join(
+        f"{stage} median {medians[stage] * 1e3:.0f} ms (best {min(samples[stage]) * 1e3:.0f} ms)"
+        for stage in samples
+    ))
+    return medians
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--exe", default=None,
+                        help=f"frozen build to measure as well (default {DEFAULT_EXE} when it exists)")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="multiply every budget, e.g. 2 on a slow CI machine")
+    args = parser.parse_args()
+
+    targets = [("script", [sys.executable, SCRIPT])]
+    exe = args.exe or (DEFAULT_EXE if os.path.exists(DEFAULT_EXE) else None)
+    if exe:
+        targets.append(("exe", [os.path.abspath(exe)]))
+
+    over = []
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = write_fixture_snapshot(os.path.join(tmp, "startup_fixture.zip"))
+        for kind, command in targets:
+            medians = bench(kind, command, snapshot, args.runs)
+            for stage, seconds in medians.items():
+                budget = BUDGETS[kind][stage] * args.budget_scale
+                if seconds > budget:
+                    over.append(f"{kind} {stage}: {seconds * 1e3:.0f} ms > {budget * 1e3:.0f} ms")
+
+    if over:
+        print("over budget:\n  " + "\n  ".join(over))
+        sys.exit(1)
+    print("within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Benchmark suite over the parsing, lookup and formatting hot paths, with stored
+baselines so performance work can be measured and regressions caught.
+
+    python -m benchmarks.suite                    # run and compare with benchmarks/baselines.json
+    python -m benchmarks.suite --save-baseline    # run and overwrite the baselines
+    python -m benchmarks.suite -k matchups        # only cases whose name contains "matchups"
+
+Inputs are the checked-in u.gg page in data_examples/ plus generated ones:
+Meraki / CDragon payloads for a full roster, a u.gg counter page with every
+rank/region block, and deterministic typo queries. Nothing touches the network;
+parse_ugg_matchups is pointed at the generated page and a throwaway ./cache.
+
+Every case reports its time per call in the fastest of --samples samples (each
+sample loops long enough to take ~0.1s). Right before each case, a fixed pure-Python
+reference workload is timed the same way, and the case is stored and compared
+as a multiple of it ("× ref"). A machine that is uniformly faster or slower, or
+busier for a while, moves both numbers together and cancels out. A case whose
+ratio is more than --tolerance above its baseline ratio is measured once more
+(bursts of other load still skew single cases); if its better ratio still is,
+it's a regression and makes the exit status 1. The 50% default is for shared or
+laptop machines; pass a tighter --tolerance on a quiet one.
+
+Re-baseline after a change that is meant to move a case (or after adding one):
+
+    python -m benchmarks.suite --save-baseline              # every case
+    python -m benchmarks.suite -k haste --save-baseline     # only these, the rest are kept
+
+on an otherwise idle machine, and commit benchmarks/baselines.json with the change.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import timeit
+
+from benchmarks.bench_fuzzy_lookup import SSR_EXAMPLE, make_queries
+from utils.abilities import parse_meraki, parse_cdragon
+from utils.champion_names import get_champ_name_variations
+from utils.champion_registry import build_registry, register_registry
+from utils.dd_champ_names import fuzzy_dd_lookup
+from utils.haste import CooldownTable, apply_haste
+from utils.matchup_store import MatchupStore, register_matchup_store, ROLES
+from utils.parse_ugg_ssr import extract_json_from_html, get_ssr_subdata, load_ssr
+from utils.patch import pin_patch_metadata
+import utils.parse_ugg_ssr as parse_ugg_ssr
+import fuzzy_cooldown_info_helper as helper
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+SSR_KEY = "window.__SSR_DATA__"
+SAMPLE_SECONDS = 0.1
+SEED = 7
+
+MATCHUP_REGIONS = ("world", "na1", "euw1", "kr", "eun1", "br1", "jp1", "la1", "la2", "oc1", "tr1", "ru")
+MATCHUP_RANKS = ("emerald_plus", "platinum_plus", "diamond_plus", "master_plus", "challenger", "overall")
+
+
+# --- inputs ---
+def example_champions(ssr: dict) -> tuple[str, dict]:
+    """ (patch, DDragon champion.json "data" block) from the example page """
+    versions = get_ssr_subdata(ssr, "prod/versions.json")
+    return versions[0], get_ssr_subdata(ssr, "en_US/champion.json")
+
+
+def make_meraki_champion(rng: random.Random) -> dict:
+    """ Meraki champion JSON shaped like champions/<Id>.json, 1-3 spells per key """
+    def modifiers(n):
+        return {"modifiers": [{"values": [round(rng.uniform(2, 120), 1) for _ in range(n)], "units": [""] * n}]}
+
+    abilities = {}
+    for key in "PQWER":
+        abilities[key] = []
+        for i in range(rng.randint(1, 3)):
+            spell = {"name": f"{key} spell {i}", "cooldown": modifiers(18 if key == "P" else 5)}
+            if rng.random() < 0.15:
+                spell["rechargeRate"] = modifiers(5)
+            abilities[key].append(spell)
+    return {"abilities": abilities}
+
+
+def make_cdragon_champion(rng: random.Random) -> tuple[dict, dict]:
+    """ (DDragon champion details, CDragon champions/<key>.json) """
+    dd = {"passive": {"name": "Passive"}, "spells": [{"name": f"{key} spell"} for key in "QWER"]}
+    cd = {"spells": []}
+    for _ in "QWER":
+        spell = {"cooldownCoefficients": [round(rng.uniform(2, 120), 1) for _ in range(6)]}
+        if rng.random() < 0.15:
+            spell["ammo"] = {"ammoRechargeTime": [round(rng.uniform(10, 40), 1) for _ in range(6)]}
+        cd["spells"].append(spell)
+    return dd, cd
+
+
+def make_counter_page(champion_key: int, opponent_keys: list[int], rng: random.Random) -> str:
+    """ A u.gg counter page: one matchups SSR block with every region × rank × role, plus filler blocks """
+    def counter(opponent):
+        return {
+            "champion_id": opponent,
+            "win_rate": rng.randint(0, 2000), "pick_rate": round(rng.random(), 4), "matches": rng.randint(0, 2000),
+            "gold_adv_15": rng.randint(-900, 900), "xp_adv_15": rng.randint(-900, 900),
+            "cs_adv_15": rng.randint(-20, 20), "kill_adv_15": rng.randint(-3, 3), "jungle_cs_adv_15": 0,
+            "carry_percentage_15": rng.randint(-200, 200), "team_gold_difference_15": rng.randint(-900, 900),
+            "duo_gold_adv_15": 0, "duo_xp_adv_15": 0, "duo_cs_adv_15": 0, "duo_kill_adv_15": 0,
+            "duo_carry_percentage_15": 0, "tier": {"pick_rate": 0, "win_rate": 0},
+        }
+
+    blocks = {
+        f"{region}_{rank}_{role}": {"counters": [counter(o) for o in rng.sample(opponent_keys, 40)]}
+        for region in MATCHUP_REGIONS for rank in MATCHUP_RANKS for role in ROLES
+    }
+    ssr = {
+        f"https://static.bigbrain.gg/assets/lol/filler/{i}.json": {
+            "data": {"rows": [[rng.random() for _ in range(20)] for _ in range(50)]},
+            "loading": False, "error": None, "idle": False,
+        }
+        for i in range(20)
+    }
+    ssr[f"https://stats2.u.gg/lol/1.5/matchups/15_10/ranked_solo_5x5/{champion_key}/1.5.0.json"] = {
+        "data": blocks, "loading": False, "error": None, "idle": False,
+    }
+    # real pages close the SSR script with an (empty) Apollo state, as in data_examples/
+    return (f"<html><head><script>{SSR_KEY} = {json.dumps(ssr)}\n"
+            f"                window.__APOLLO_STATE__ = {{}}\n              </script></head><body></body></html>")
+
+
+# --- cases ---
+def build_cases() -> dict:
+    """ name -> zero-argument callable; every input is built up front """
+    rng = random.Random(SEED)
+    with open(SSR_EXAMPLE, encoding="utf-8") as f:
+        example_html = f.read()
+    example_ssr = extract_json_from_html(example_html, SSR_KEY)
+    patch, champion_data = example_champions(example_ssr)
+    registry = build_registry(patch, champion_data, None)
+    name_map = dict(registry.name_map)
+    alias_map = {
+        c.name: {"slug": c.slug, "name": c.name, "aliases": sorted({c.name, *c.aliases})} for c in registry.champions
+    }
+    queries = make_queries(name_map, 500, SEED)
+
+    meraki = [make_meraki_champion(rng) for _ in registry.champions]
+    cdragon = [make_cdragon_champion(rng) for _ in registry.champions]
+    ability_rows = [parse_meraki(m) for m in meraki]
+    cd_lists = [[round(rng.uniform(0.5, 200), 2) for _ in range(rng.choice((1, 3, 5, 18)))] for _ in range(1000)]
+
+    vi = registry.by_slug("vi")
+    counter_page = make_counter_page(vi.key, [c.key for c in registry.champions if c.key != vi.key], rng)
+    champion = {"slug": vi.slug}
+
+    # parse_ugg_matchups: patch metadata, registry and store are local, the page is the generated one
+    pin_patch_metadata([patch], {})
+    register_registry(registry)
+    parse_ugg_ssr.fetch_champ_counter_ugg = lambda slug, role=None, **kw: counter_page
+
+    def matchups_from_page():
+        register_matchup_store(MatchupStore(patch))  # empty, so the page is parsed and ingested
+        return parse_ugg_ssr.parse_ugg_matchups(champion, "top")
+
+    warm_store = MatchupStore(patch)
+    warm_store.ingest_ssr(load_ssr(counter_page))
+
+    def matchups_from_store():
+        register_matchup_store(warm_store)
+        return parse_ugg_ssr.parse_ugg_matchups(champion, "top")
+
+    roster_rows = {c.id: rows for c, rows in zip(registry.champions, ability_rows)}
+    haste_table = CooldownTable(roster_rows)
+    team = [c.id for c in registry.champions[:5]]
+
+    return {
+        "parse_meraki/roster": lambda: [parse_meraki(m) for m in meraki],
+        "parse_cdragon/roster": lambda: [parse_cdragon(dd, cd) for dd, cd in cdragon],
+        "extract_json_from_html/tier_list_page": lambda: extract_json_from_html(example_html, SSR_KEY),
+        "extract_json_from_html/counter_page": lambda: extract_json_from_html(counter_page, SSR_KEY),
+        "get_ssr_subdata/decoded": lambda: get_ssr_subdata(example_ssr, "en_US/champion.json"),
+        "get_ssr_subdata/lazy": lambda: get_ssr_subdata(load_ssr(example_html, SSR_KEY), "en_US/champion.json"),
+        "parse_ugg_matchups/page": matchups_from_page,
+        "parse_ugg_matchups/store": matchups_from_store,
+        "fuzzy_dd_lookup/500_typos": lambda: [_or_none(fuzzy_dd_lookup, q, name_map) for q in queries],
+        "get_champ_name_variations/500_typos": lambda: [_or_none(get_champ_name_variations, q, alias_map) for q in queries],
+        "fmt_cd_list/1000_lists": lambda: [helper.fmt_cd_list(v) for v in cd_lists],
+        "build_cooldown_rows/roster": lambda: [helper.build_cooldown_rows(rows) for rows in ability_rows],
+        "tabulate_table/roster": lambda: [_table(rows) for rows in ability_rows],
+        "CooldownTable/roster": lambda: CooldownTable(roster_rows),
+        "CooldownTable.query/team_ultimates_at_100": lambda: haste_table.query(team, ["R"], 100),
+        "CooldownTable.query/roster_at_63": lambda: haste_table.query(haste=63),
+        "apply_haste/roster_at_63": lambda: [apply_haste(rows, 63) for rows in ability_rows],
+    }
+
+
+def _or_none(lookup, query, names):
+    """ Unmatched typo queries raise ValueError, which is part of what's timed """
+    try:
+        return lookup(query, names)
+    except ValueError:
+        return None
+
+
+def _table(rows):
+    from tabulate import tabulate
+    return tabulate(helper.build_cooldown_rows(rows), headers=["Key", "Ability", "Cooldowns"], tablefmt="fancy_grid")
+
+
+# --- running / reporting ---
+def reference_workload():
+    """ Fixed interpreter work (JSON round trip, dict building, sorting, string formatting) cases are measured against """
+    data = [{"id": i, "name": f"champion{i % 97}", "values": [i * 0.5, i * 1.5, i * 2.5]} for i in range(300)]
+    decoded = json.loads(json.dumps(data))
+    return sorted((d["name"], ", ".join(f"{v:g}" for v in d["values"])) for d in decoded)
+
+
+def time_case(fn, samples: int) -> float:
+    """ Fastest sample's seconds per call; slower samples are other load on the machine, not the code """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, int(number * SAMPLE_SECONDS / 0.2))  # autorange aims for 0.2s
+    return min(timer.repeat(repeat=samples, number=number)) / number
+
+
+def machine() -> str:
+    return f"{platform.machine()} {platform.system()} / {platform.python_implementation()} {platform.python_version()}"
+
+
+def fmt_seconds(s: float) -> str:
+    if s >= 1:
+        return f"{s:.2f} s"
+    if s >= 1e-3:
+        return f"{s * 1e3:.2f} ms"
+    return f"{s * 1e6:.1f} µs"
+
+
+def report(results: dict, ratios: dict, baseline: dict, tolerance: float) -> list[str]:
+    """ Print the comparison table, return the regressed case names """
+    regressions = []
+    width = max(len(name) for name in results)
+    print(f"{'case':<{width}}  {'best':>10}  {'× ref':>9}  {'baseline':>9}  {'change':>8}")
+    for name, seconds in results.items():
+        ratio, base = ratios[name], baseline.get("ratios", {}).get(name)
+        if base is None:
+            print(f"{name:<{width}}  {fmt_seconds(seconds):>10}  {ratio:>9.3g}  {'-':>9}  {'new':>8}")
+            continue
+        change = ratio / base - 1
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -tolerance:
+            flag = "  faster"
+        print(f"{name:<{width}}  {fmt_seconds(seconds):>10}  {ratio:>9.3g}  {base:>9.3g}  {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown of a case's × ref ratio vs its baseline (0.5 = 50%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args()
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except OSError:
+        baseline = {}
+
+    results, ratios = {}, {}
+
+    def measure(name, fn):
+        reference = time_case(reference_workload, args.samples)  # next to the case, so drift hits both
+        seconds = time_case(fn, args.samples)
+        if name not in ratios or seconds / reference < ratios[name]:
+            results[name], ratios[name] = seconds, seconds / reference
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # matchup store saves go to a throwaway ./cache
+        cases = build_cases()
+        for name, fn in cases.items():
+            if args.filter in name:
+                measure(name, fn)
+        for name, base in baseline.get("ratios", {}).items():
+            if name in ratios and ratios[name] / base - 1 > args.tolerance:
+                measure(name, cases[name])  # confirm before calling it a regression
+
+    if baseline and "ratios" not in baseline:
+        print("note: the baseline holds absolute timings only; re-baseline with --save-baseline\n")
+    elif baseline and baseline.get("machine") != machine():
+        print(f"note: baseline was recorded on {baseline.get('machine')}, this is {machine()} "
+              f"(ratios carry over roughly; re-baseline if cases flag)\n")
+    regressions = report(results, ratios, baseline, args.tolerance)
+
+    if args.save_baseline:
+        keep = baseline if args.filter and "ratios" in baseline else {}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "machine": machine(),
+                "ratios": {**keep.get("ratios", {}), **ratios},
+                "cases": {**keep.get("cases", {}), **results},  # absolute seconds, for reference only
+            }, f, indent=2)
+        print(f"\nbaseline saved to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
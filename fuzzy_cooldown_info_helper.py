@@ -1,261 +1,299 @@
 import os
 import sys
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
-
-import requests
-from tabulate import tabulate
+import argparse
 import platform
+import threading
+
+# Only what the prompt needs is imported here. rich/tabulate load with the first
+# table, requests with the first request, and the --prefetch/--crawl/--offline
+# machinery only when its flag is given (see benchmarks/bench_startup.py).
+from utils.dd_champ_names import fuzzy_dd_lookup
+from utils.abilities import fetch_latest_patch, get_champion_abilities, race_champion_sources, HEDGE_BUDGET
+from utils.matchup_store import ROLES
+from utils.session import LookupSession
+from utils.autocomplete import autocomplete_input, raw_terminal_available, SpeculativePrefetcher
+from utils import http_client, profiler
+
+# mirrored from utils.crawler so building the argument parser doesn't import the crawler
+CHAMPION_POOL_PATH = "champion_pool.txt"
+CRAWL_RATE = 4.0
+CRAWL_CONCURRENCY = 8
+BATCH_FORMATS = ("ndjson", "csv")  # mirrored from utils.batch
+API_PORT = 8780  # mirrored from utils.api_server
+
+PROMPT = "Enemy champion(s) (ex. 'Vi + Gnar'): "
+MAX_FETCH_WORKERS = 5  # "Vi + Gnar" style queries rarely name more than a full team
 
-# Assuming these exist based on your snippet
-from utils.champion_names import load_champ_name_map
-from utils.dd_champ_names import fuzzy_dd_lookup, load_ddragon_champion_map
+def clear():
+    if platform.system() == "Windows": os.system("cls")
+    else: os.system("clear")
 
-# --- SOURCE 1: MERAKI (High Quality, Slower Updates) ---
-def fetch_meraki_champion(champ_key: str):
-    url = f"https://cdn.merakianalytics.com/riot/lol/resources/latest/en-US/champions/{champ_key}.json"
-    try:
-        r = requests.get(url, timeout=2) # Short timeout so we don't hang if site is slow
-        if r.status_code == 200:
-            return r.json()
-    except:
-        pass
-    return None
+# --- FORMATTING ---
+# Helper function to format seconds into "Xm Ys"
+def fmt_time(t):
+    if t < 60:
+        # round to 1 decimal place, remove trailing , but ONLY if there was a decimal
+        s = round(t, 1)
+        if s == int(s): s = int(s) # Clean look for exact seconds
+        return str(s)
+    if(t==60):
+        return "1m"
 
-def parse_meraki(meraki_data):
-    if not meraki_data or "abilities" not in meraki_data:
-        return []
+    m = int(t // 60)
+    s = round(t % 60, 1)
+    if s == int(s): s = int(s) # Clean look for exact seconds
+    formatted_output = f"{m}m {s}"
+    return formatted_output
 
-    rows = []
-    order = ["P", "Q", "W", "E", "R"]
-    for key in order:
-        spell_list = meraki_data["abilities"].get(key, [])
-        for spell in spell_list:
-            name = spell.get("name", "Unknown")
-
-            # Cooldowns
-            cd_values = []
-            if spell.get("cooldown") and "modifiers" in spell["cooldown"]:
-                for mod in spell["cooldown"]["modifiers"]:
-                    if "values" in mod:
-                        cd_values = mod["values"]
-                        break
-
-            # Recharge
-            rec_values = []
-            rec_obj = spell.get("rechargeRate")
-            if isinstance(rec_obj, list): rec_values = rec_obj
-            elif isinstance(rec_obj, dict) and "modifiers" in rec_obj:
-                for mod in rec_obj["modifiers"]:
-                    if "values" in mod:
-                        rec_values = mod["values"]
-                        break
-            elif isinstance(rec_obj, (int, float)): rec_values = [rec_obj]
-
-            rows.append({
-                "source": "Meraki",
-                "key": key,
-                "name": name,
-                "cooldowns": cd_values,
-                "recharge": rec_values
-            })
-    return rows
+# Helper to format list of cooldowns (Compresses 1-18 scaling)
+def fmt_cd_list(vals):
+    if not vals: return "-"
 
-# --- SOURCE 2: CDRAGON + DDRAGON (Raw Data, Always Up-to-Date) ---
-def fetch_latest_patch():
-    return requests.get("https://ddragon.leagueoflegends.com/api/versions.json").json()[0]
-
-def fetch_ddragon_details(slug: str, patch: str):
-    url = f"https://ddragon.leagueoflegends.com/cdn/{patch}/data/en_US/champion/{slug}.json"
-    r = requests.get(url)
-    if r.status_code != 200: return None
-    return r.json()["data"][slug]
-
-def fetch_cdragon_data(champ_id: int):
-    url = f"https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/champions/{champ_id}.json"
-    r = requests.get(url)
-    if r.status_code != 200: return None
-    return r.json()
-
-def parse_cdragon(dd_data, cd_data):
-    out = []
-
-    # 1. Passive (from DDragon for name)
-    out.append({
-        "source": "CDragon",
-        "key": "P",
-        "name": dd_data["passive"]["name"],
-        "cooldowns": [],
-        "recharge": []
-    })
-
-    # 2. Spells (Q-R)
-    # CDragon spells list: 0=Q, 1=W, 2=E, 3=R
-    keys = ["Q", "W", "E", "R"]
-    cd_spells = cd_data["spells"]
-    dd_spells = dd_data["spells"]
-
-    for i in range(min(len(cd_spells), 4)):
-        s_cd = cd_spells[i]
-
-        # Name Fallback
-        name = dd_spells[i]["name"] if i < len(dd_spells) else s_cd.get("name", "Unknown")
-
-        # Cooldowns
-        raw_cds = s_cd.get("cooldownCoefficients", [])
-
-        # Ammo
-        recharge = []
-        ammo_data = s_cd.get("ammo")
-        if ammo_data:
-            recharge = ammo_data.get("ammoRechargeTime", [])
-
-        out.append({
-            "source": "CDragon",
-            "key": keys[i] if i < 4 else "?",
-            "name": name,
-            "cooldowns": raw_cds,
-            "recharge": recharge
-        })
-    return out
+    # Standard short list (e.g. 5 ranks) -> Keep commas
+    if len(vals) <= 10:
+        return ", ".join(fmt_time(x) for x in vals)
 
-def clear():
-    if platform.system() == "Windows": os.system("cls")
-    else: os.system("clear")
-# --- MAIN LOGIC ---
-def main():
-    patch = fetch_latest_patch()
-    name_map = load_ddragon_champion_map(patch)
-
-    # Helper to format list of cooldowns (Compresses 1-18 scaling)
-    def fmt_cd_list(vals):
-        if not vals: return "-"
-
-        # Standard short list (e.g. 5 ranks) -> Keep commas
-        if len(vals) <= 10:
-            return ", ".join(fmt_time(x) for x in vals)
-
-        # Long list (18 levels) -> Use ellipses without commas for cleaner look
-        # Extract Levels 1, 6, 12, 18
-        key_levels = []
-        key_levels.append(fmt_time(vals[0])) # Level 1
-
-        if len(vals) >= 6:
-            key_levels.append(fmt_time(vals[5])) # Level 6
-
-        if len(vals) >= 12:
-            key_levels.append(fmt_time(vals[11])) # Level 12
-
-        if len(vals) > 12:
-            key_levels.append(fmt_time(vals[-1])) # Level 18
-
-        # Join with space-ellipses-space (e.g. "16 ... 14.8 ... 12")
-        return ",(...),".join(key_levels)
-
-    # Helper function to format seconds into "Xm Ys"
-    def fmt_time(t):
-        if t < 60:
-            # round to 1 decimal place, remove trailing , but ONLY if there was a decimal
-            s = round(t, 1)
-            if s == int(s): s = int(s) # Clean look for exact seconds
-            return str(s)
-        if(t==60):
-            return "1m"
-
-        m = int(t // 60)
-        s = round(t % 60, 1)
-        if s == int(s): s = int(s) # Clean look for exact seconds
-        formatted_output = f"{m}m {s}"
-        return formatted_output
+    # Long list (18 levels) -> Use ellipses without commas for cleaner look
+    # Extract Levels 1, 6, 12, 18
+    key_levels = []
+    key_levels.append(fmt_time(vals[0])) # Level 1
 
-    raw_input = input("Enemy champion(s) (ex. 'Vi + Gnar'): ").strip()
-    if not raw_input: return
+    if len(vals) >= 6:
+        key_levels.append(fmt_time(vals[5])) # Level 6
 
-    # Split input by "+" to handle single or botlane (multiple) queries
-    queries = [q.strip() for q in raw_input.split('+') if q.strip()]
+    if len(vals) >= 12:
+        key_levels.append(fmt_time(vals[11])) # Level 12
 
-    for i, query in enumerate(queries):
-        # Visual separator between champions
-        if i > 0: print("\n" + "="*60)
+    if len(vals) > 12:
+        key_levels.append(fmt_time(vals[-1])) # Level 18
 
-        # 1. Identify Champion
-        champ_slug = fuzzy_dd_lookup(query, name_map)
-        # print(f"\nLooking up: {champ_slug}...")
-
-        abilities = []
-        source_used = "Unknown"
-
-        # 2. TRY MERAKI FIRST
-        meraki_data = fetch_meraki_champion(champ_slug)
-        if meraki_data:
-            parsed = parse_meraki(meraki_data)
-            if parsed:
-                abilities = parsed
-                source_used = "Meraki Analytics (Wiki)"
-
-        # 3. FALLBACK TO CDRAGON
-        if not abilities:
-            # print(f"(!) Meraki missing data for {champ_slug}. Falling back to Raw Game Files...")
-
-            dd_champ = fetch_ddragon_details(champ_slug, patch)
-            if dd_champ:
-                champ_key = int(dd_champ["key"])
-                cd_champ = fetch_cdragon_data(champ_key)
-                if cd_champ:
-                    abilities = parse_cdragon(dd_champ, cd_champ)
-                    source_used = "Community Dragon (Raw Client)"
-
-        # 4. Display
-        if not abilities:
-            print(f"Error: Could not find data for {champ_slug} in either source.")
-            continue
-
-        # print(f"--- {champ_slug} ---")
-        # print the champion's slug bolded
-        # print(f"--- \033[1m{champ_slug}\033[0m ---")
-        header_text = Text(
-            champ_slug,
-            style="bold white on black", # Use a strong style to make it pop!
-            justify="center"
-        )
-        header_panel = Panel(header_text, expand=False, padding=(0, 1))
-        console = Console()
-        console.print(header_panel)
+    # Join with space-ellipses-space (e.g. "16 ... 14.8 ... 12")
+    return ",(...),".join(key_levels)
 
-        headers = ["Key", "Ability", "Cooldowns"]
-        rows = []
+def build_cooldown_rows(abilities):
+    """ [Key, Ability, Cooldowns] table rows for parsed ability rows """
+    rows = []
 
-        for a in abilities:
-            cd_vals = a["cooldowns"]
-            rec_vals = a["recharge"]
+    for a in abilities:
+        cd_vals = a["cooldowns"]
+        rec_vals = a["recharge"]
 
-            # Check if it's an ammo ability
-            has_recharge = rec_vals and any(x > 0 for x in rec_vals)
-            final_str = "-"
+        # Check if it's an ammo ability
+        has_recharge = rec_vals and any(x > 0 for x in rec_vals)
+        final_str = "-"
 
-            if has_recharge:
-                rec_str = fmt_cd_list(rec_vals)
+        if has_recharge:
+            rec_str = fmt_cd_list(rec_vals)
 
-                # Check for "Significant" Static Cooldown (> 2s)
-                max_cd = max(cd_vals) if cd_vals else 0
+            # Check for "Significant" Static Cooldown (> 2s)
+            max_cd = max(cd_vals) if cd_vals else 0
 
-                if max_cd > 2:
-                    # The "Amumu" Case: Show Both
-                    static_str = fmt_cd_list(cd_vals)
-                    final_str = f"{static_str} (Cast) / {rec_str} (Recharge)"
-                else:
-                    # The "Teemo" Case: Show Recharge Only
-                    final_str = f"{rec_str} (Recharge)"
+            if max_cd > 2:
+                # The "Amumu" Case: Show Both
+                static_str = fmt_cd_list(cd_vals)
+                final_str = f"{static_str} (Cast) / {rec_str} (Recharge)"
+            else:
+                # The "Teemo" Case: Show Recharge Only
+                final_str = f"{rec_str} (Recharge)"
 
-            elif cd_vals and any(x > 0 for x in cd_vals):
-                # Standard Ability
-                final_str = fmt_cd_list(cd_vals)
+        elif cd_vals and any(x > 0 for x in cd_vals):
+            # Standard Ability
+            final_str = fmt_cd_list(cd_vals)
 
-            rows.append([a["key"], a["name"], final_str])
+        rows.append([a["key"], a["name"], final_str])
+    return rows
 
-        print(tabulate(rows, headers=headers, tablefmt="fancy_grid"))
+_console_instance = None
+
+def _console():
+    """ One rich Console for the whole run, created with the first table """
+    global _console_instance
+    if _console_instance is None:
+        from rich.console import Console
+        _console_instance = Console()
+    return _console_instance
+
+def render_champion(champ_slug, abilities, haste=None):
+    if not abilities:
+        print(f"Error: Could not find data for {champ_slug} in either source.")
+        return
+
+    headers = ["Key", "Ability", "Cooldowns"]
+    if haste:
+        from utils.haste import apply_haste  # numpy; only loaded for --haste
+        abilities = apply_haste(abilities, haste)
+        headers[2] = f"Cooldowns @ {haste:g} AH"
+
+    from rich.panel import Panel
+    from rich.text import Text
+    from tabulate import tabulate
+
+    # print the champion's slug bolded
+    header_text = Text(
+        champ_slug,
+        style="bold white on black", # Use a strong style to make it pop!
+        justify="center"
+    )
+    header_panel = Panel(header_text, expand=False, padding=(0, 1))
+    console = _console()
+    console.print(header_panel)
+
+    print(tabulate(build_cooldown_rows(abilities), headers=headers, tablefmt="fancy_grid"))
+
+def fmt_patch_diff(diff):
+    """ Lines like "Vi  Q Vault Breaker: 12, 10.5, 9, 7.5, 6 -> 11, 9.5, 8, 6.5, 5" """
+    lines = []
+    for champ, changes in sorted(diff.items()):
+        for c in changes:
+            label = "" if c["field"] == "cooldowns" else " (Recharge)"
+            old = fmt_cd_list(c["old"]) if c["old"] is not None else "new"
+            lines.append(f"{champ:<12} {c['key']} {c['name']}{label}: {old} -> {fmt_cd_list(c['new'])}")
+    return lines
+
+def fmt_race_report(source_used, timings):
+    """ e.g. "source: Meraki Analytics (Wiki) | Meraki 0.31s, CDragon still running" """
+    parts = [
+        f"{name} {elapsed:.2f}s" if elapsed is not None else f"{name} still running"
+        for name, elapsed in timings.items()
+    ]
+    return f"source: {source_used} | " + ", ".join(parts)
+
+# --- MAIN LOGIC ---
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzzy League of Legends cooldown lookup")
+    parser.add_argument("--hedge", action="store_true",
+                        help="query Meraki and CDragon at the same time instead of one after the other")
+    parser.add_argument("--hedge-budget", type=float, default=HEDGE_BUDGET, metavar="SECONDS",
+                        help=f"how long Meraki may take before CDragon is used (default {HEDGE_BUDGET})")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="download the whole patch's ability data into the local cache and exit")
+    parser.add_argument("--update-patch", action="store_true",
+                        help="move the cache to the newest patch and print which champions' cooldowns changed (downloads Meraki's "
+                             "all-champion file; rerun after Meraki catches up with a new patch)")
+    parser.add_argument("--background-prefetch", action="store_true",
+                        help="fill the local cache for the whole patch in the background while the prompt runs")
+    parser.add_argument("--crawl", action="store_true",
+                        help="fetch u.gg matchup pages for every champion in the pool and role, then exit")
+    parser.add_argument("--pool", default=CHAMPION_POOL_PATH, metavar="FILE",
+                        help=f"champion list for --crawl, one per line (default {CHAMPION_POOL_PATH})")
+    parser.add_argument("--roles", nargs="+", default=list(ROLES), choices=ROLES,
+                        help="roles to crawl (default: all)")
+    parser.add_argument("--rate", type=float, default=CRAWL_RATE,
+                        help=f"max u.gg requests per second while crawling (default {CRAWL_RATE})")
+    parser.add_argument("--concurrency", type=int, default=CRAWL_CONCURRENCY,
+                        help=f"max parallel u.gg requests while crawling (default {CRAWL_CONCURRENCY})")
+    parser.add_argument("--export-snapshot", nargs="?", const="", metavar="PATH",
+                        help="prefetch the patch and write an offline snapshot (default ./snapshot/), then exit")
+    parser.add_argument("--offline", nargs="?", const="", metavar="SNAPSHOT",
+                        help="answer only from a snapshot (default: newest in ./snapshot/), no network at all")
+    parser.add_argument("--watch", action="store_true",
+                        help="follow the League client's champ select and show each enemy pick as it locks in")
+    parser.add_argument("--lcu", metavar="URL",
+                        help="client API to watch instead of the lockfile's (e.g. a utils.lcu_replay server)")
+    parser.add_argument("--lockfile", metavar="PATH", help="League client lockfile (default: standard install path)")
+    parser.add_argument("--record", metavar="FILE", help="with --watch, save the champ select sessions for replay")
+    parser.add_argument("--profile", action="store_true",
+                        help="print wall time, bytes and cache hits/misses of every stage after each lookup")
+    parser.add_argument("--profile-trace", metavar="FILE",
+                        help="also write the profile as a Chrome trace (chrome://tracing, Perfetto); implies --profile")
+    parser.add_argument("--haste", type=float, metavar="AH",
+                        help="show cooldowns at this much ability haste (passives unchanged); see also python -m utils.haste")
+    parser.add_argument("--batch", nargs="*", metavar="QUERY",
+                        help="look up these champions (or stdin's, if none and no --batch-file) without the prompt, "
+                             "streaming one result per line, then exit")
+    parser.add_argument("--batch-file", metavar="FILE",
+                        help="batch queries from FILE, one per line like champion_pool.txt ('-' for stdin)")
+    parser.add_argument("--format", choices=BATCH_FORMATS, default="ndjson", help="batch output format (default ndjson)")
+    parser.add_argument("--serve", nargs="?", type=int, const=API_PORT, metavar="PORT",
+                        help=f"serve /cooldowns, /resolve and /matchups as JSON on 127.0.0.1 (default port {API_PORT})")
+    parser.add_argument("--no-autocomplete", action="store_true",
+                        help="plain input() prompt: no live suggestions, no fetching before Enter")
+    return parser.parse_args(argv)
+
+def main(args=None, session=None):
+    args = args or parse_args([])
+    session = session or LookupSession(MAX_FETCH_WORKERS)
+    change = session.take_patch_change()
+    if change:
+        print(f"Patch {change[0]} → {change[1]}: now showing {change[1]} data.\n")
+
+    # patch and name map as of now, even if a background refresh swaps them meanwhile
+    patch, registry = session.current()
+    name_map = registry.name_map
+    if args.hedge:
+        fetch = lambda slug: _fetch_stage(race_champion_sources, slug, patch, args.hedge_budget)
+    else:
+        fetch = lambda slug: _fetch_stage(get_champion_abilities, slug, patch)
+
+    # Suggestions while typing, and the top one's abilities already downloading
+    prefetcher = None
+    if not args.no_autocomplete and raw_terminal_available():
+        prefetcher = SpeculativePrefetcher(session.pool, fetch)
+        raw_input = autocomplete_input(PROMPT, registry, prefetcher).strip()
+    else:
+        raw_input = input(PROMPT).strip()
+    try:
+        if not raw_input: return
+
+        # Split input by "+" to handle single or botlane (multiple) queries
+        queries = [q.strip() for q in raw_input.split('+') if q.strip()]
+
+        # 1. Identify Champions
+        with profiler.stage("fuzzy_dd_lookup", queries=len(queries)):
+            champ_slugs = [fuzzy_dd_lookup(query, name_map) for query in queries]
+
+        # 2. Fetch every champion at once: Meraki first, CDragon fallback
+        #    (served from the local cache when possible) on the session's long-lived workers,
+        #    picking up the speculative fetch where the guess was right
+        futures = [(prefetcher and prefetcher.take(slug)) or session.pool.submit(fetch, slug)
+                   for slug in champ_slugs]
+    finally:
+        if prefetcher:
+            prefetcher.close()
+
+    # 3. Display in input order, each one as soon as it (and those before it) are ready
+    for i, (champ_slug, future) in enumerate(zip(champ_slugs, futures)):
+        # Visual separator between champions
+        if i > 0: print("\n" + "="*60)
+
+        with profiler.stage("wait for abilities", champion=champ_slug):
+            result = future.result()
+        with profiler.stage("render", champion=champ_slug):
+            if args.hedge:
+                abilities, source_used, timings = result
+                render_champion(champ_slug, abilities, args.haste)
+                print(fmt_race_report(source_used, timings))
+            else:
+                abilities, source_used = result
+                render_champion(champ_slug, abilities, args.haste)
+
+
+def _fetch_stage(fetch, champ_slug, *args):
+    """ One champion's ability lookup as a profiler stage, tagged with the source that answered """
+    with profiler.stage("fetch abilities", champion=champ_slug) as span:
+        result = fetch(champ_slug, *args)
+        span.args["source"] = result[1]
+    return result
+
+
+def watch(args):
+    """ Show enemy picks as they lock in, one champ select after another, until Ctrl+C """
+    from concurrent.futures import ThreadPoolExecutor
+    from utils.lcu import LCUClient
+    from utils.champselect import watch_champ_select, save_recording, PickPrefetcher, PICK_WORKERS
+
+    client = LCUClient(args.lcu) if args.lcu else LCUClient.from_lockfile(args.lockfile)
+    with ThreadPoolExecutor(max_workers=PICK_WORKERS, thread_name_prefix="pick") as pool:
+        while True:
+            print(f"Waiting for champ select on {client.base_url}...")
+            prefetcher = PickPrefetcher(fetch_latest_patch(), render_champion, pool)
+            recording = [] if args.record else None
+            watch_champ_select(client, prefetcher.on_pick, recording=recording)
+            prefetcher.wait()
+            print("\n" + prefetcher.report())
+            if recording:
+                save_recording(recording, args.record)
+                print(f"Recorded {len(recording)} session reads to {args.record}")
 
 
 def wait_for_enter_only(prompt="Press Enter to reset..."):
@@ -310,12 +348,98 @@ def wait_for_enter_only(prompt="Press Enter to reset..."):
 
 
 
+_reported_connections = {"requests": 0, "opened": 0}
+
+
+def report_profile(args):
+    summary = profiler.take_summary()
+    if summary:
+        print("\n" + summary)
+    # like take_summary(), only what happened since the last report
+    connections = http_client.connection_stats()
+    sent = max(connections["requests"] - _reported_connections["requests"], 0)
+    opened = max(connections["opened"] - _reported_connections["opened"], 0)
+    _reported_connections.update(requests=connections["requests"], opened=connections["opened"])
+    if sent:
+        print(f"connections: {sent} requests, {opened} opened, {max(sent - opened, 0)} reused")
+    if args.profile_trace:
+        profiler.export_chrome_trace(args.profile_trace)
+        print(f"trace written to {args.profile_trace}")
+
+
 if __name__ == "__main__":
+    cli_args = parse_args()
+    if cli_args.profile or cli_args.profile_trace:
+        import atexit
+        profiler.enable()
+        atexit.register(report_profile, cli_args)  # --prefetch / --crawl / --watch runs
+    if cli_args.offline is not None:
+        from utils.snapshot import load_snapshot, latest_snapshot_path
+        snapshot_path = cli_args.offline or latest_snapshot_path()
+        if not snapshot_path:
+            print("No snapshot found; create one with --export-snapshot while online.")
+            sys.exit(1)
+        manifest = load_snapshot(snapshot_path)
+        print(f"Offline mode: patch {manifest['latest_patch']} from {snapshot_path}", file=sys.stderr)
+    if cli_args.export_snapshot is not None:
+        from utils.prefetch import prefetch_patch
+        from utils.snapshot import export_snapshot
+        prefetch_patch(fetch_latest_patch())
+        print(f"Snapshot written to {export_snapshot(cli_args.export_snapshot or None)}")
+        sys.exit(0)
+    if cli_args.update_patch:
+        from utils.patch_update import update_patch
+        stats = update_patch(fetch_latest_patch())
+        for line in fmt_patch_diff(stats["diff"]):
+            print(line)
+        sys.exit(0)
+    if cli_args.prefetch:
+        from utils.prefetch import prefetch_patch
+        prefetch_patch(fetch_latest_patch())
+        sys.exit(0)
+    if cli_args.crawl:
+        from utils.crawler import crawl_matchups, read_champion_pool
+        crawl_matchups(read_champion_pool(cli_args.pool), cli_args.roles, cli_args.rate, cli_args.concurrency)
+        sys.exit(0)
+    if cli_args.batch is not None or cli_args.batch_file:
+        from utils.batch import run_batch, read_queries, BATCH_WORKERS
+        batch_file = cli_args.batch_file or (None if cli_args.batch else "-")
+        fetch = race_champion_sources if cli_args.hedge else get_champion_abilities
+        stats = run_batch(
+            read_queries(cli_args.batch or (), batch_file), LookupSession(BATCH_WORKERS), fetch,
+            fmt=cli_args.format, haste=cli_args.haste, progress=lambda msg: print(msg, file=sys.stderr),
+        )
+        sys.exit(1 if stats["failed"] else 0)
+    if cli_args.serve:
+        from utils.api_server import serve
+        lookup_session = LookupSession(MAX_FETCH_WORKERS)
+        lookup_session.start()
+        serve(lookup_session, race_champion_sources if cli_args.hedge else get_champion_abilities, cli_args.serve)
+        sys.exit(0)
+    if cli_args.watch:
+        try:
+            watch(cli_args)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+    if cli_args.background_prefetch:
+        from utils.prefetch import prefetch_patch
+        threading.Thread(
+            target=lambda: prefetch_patch(fetch_latest_patch(), progress=None),
+            name="prefetch", daemon=True,
+        ).start()
+    # patch, name map, HTTP pool and caches are set up once and kept fresh in the background
+    lookup_session = None
     while True:
         try:
-            main()
+            if lookup_session is None:
+                lookup_session = LookupSession(MAX_FETCH_WORKERS)
+                lookup_session.start()
+            main(cli_args, lookup_session)
         except Exception as e:
             print(f"\nError: {e}")
+        if profiler.is_enabled():
+            report_profile(cli_args)
         # input("\nPress Enter to restart...")
         wait_for_enter_only("\nPress Enter to restart...")
         clear()
@@ -0,0 +1,242 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from utils import http_client, profiler
+from utils.patch import get_versions
+from utils.ability_cache import get_cached_abilities, put_cached_abilities
+
+# --- SOURCE 1: MERAKI (High Quality, Slower Updates) ---
+def fetch_meraki_champion(champ_key: str):
+    url = f"https://cdn.merakianalytics.com/riot/lol/resources/latest/en-US/champions/{champ_key}.json"
+    try:
+        # Short timeout and no hidden retries so we don't hang if site is slow; CDragon is the fallback
+        r = http_client.get(url, timeout=2, retries=False)
+        if r.status_code == 200:
+            return r.json()
+    except:
+        pass
+    return None
+
+def parse_meraki(meraki_data):
+    if not meraki_data or "abilities" not in meraki_data:
+        return []
+
+    rows = []
+    order = ["P", "Q", "W", "E", "R"]
+    for key in order:
+        spell_list = meraki_data["abilities"].get(key, [])
+        for spell in spell_list:
+            name = spell.get("name", "Unknown")
+
+            # Cooldowns
+            cd_values = []
+            if spell.get("cooldown") and "modifiers" in spell["cooldown"]:
+                for mod in spell["cooldown"]["modifiers"]:
+                    if "values" in mod:
+                        cd_values = mod["values"]
+                        break
+
+            # Recharge
+            rec_values = []
+            rec_obj = spell.get("rechargeRate")
+            if isinstance(rec_obj, list): rec_values = rec_obj
+            elif isinstance(rec_obj, dict) and "modifiers" in rec_obj:
+                for mod in rec_obj["modifiers"]:
+                    if "values" in mod:
+                        rec_values = mod["values"]
+                        break
+            elif isinstance(rec_obj, (int, float)): rec_values = [rec_obj]
+
+            rows.append({
+                "source": "Meraki",
+                "key": key,
+                "name": name,
+                "cooldowns": cd_values,
+                "recharge": rec_values
+            })
+    return rows
+
+# --- SOURCE 2: CDRAGON + DDRAGON (Raw Data, Always Up-to-Date) ---
+def fetch_latest_patch():
+    return get_versions()[0]
+
+def fetch_ddragon_details(slug: str, patch: str):
+    url = f"https://ddragon.leagueoflegends.com/cdn/{patch}/data/en_US/champion/{slug}.json"
+    r = http_client.get(url, retries=False)  # on the lookup path: fail fast, don't retry
+    if r.status_code != 200: return None
+    return r.json()["data"][slug]
+
+def fetch_cdragon_data(champ_id: int, retries: bool = False):
+    """ retries – True for bulk fetches (--prefetch); lookups fail fast by default """
+    url = f"https://raw.communitydragon.org/latest/plugins/rcp-be-lol-game-data/global/default/v1/champions/{champ_id}.json"
+    r = http_client.get(url, retries=retries)
+    if r.status_code != 200: return None
+    return r.json()
+
+def parse_cdragon(dd_data, cd_data):
+    out = []
+
+    # 1. Passive (from DDragon for name)
+    out.append({
+        "source": "CDragon",
+        "key": "P",
+        "name": dd_data["passive"]["name"],
+        "cooldowns": [],
+        "recharge": []
+    })
+
+    # 2. Spells (Q-R)
+    # CDragon spells list: 0=Q, 1=W, 2=E, 3=R
+    keys = ["Q", "W", "E", "R"]
+    cd_spells = cd_data["spells"]
+    dd_spells = dd_data["spells"]
+
+    for i in range(min(len(cd_spells), 4)):
+        s_cd = cd_spells[i]
+
+        # Name Fallback
+        name = dd_spells[i]["name"] if i < len(dd_spells) else s_cd.get("name", "Unknown")
+
+        # Cooldowns
+        raw_cds = s_cd.get("cooldownCoefficients", [])
+
+        # Ammo
+        recharge = []
+        ammo_data = s_cd.get("ammo")
+        if ammo_data:
+            recharge = ammo_data.get("ammoRechargeTime", [])
+
+        out.append({
+            "source": "CDragon",
+            "key": keys[i] if i < 4 else "?",
+            "name": name,
+            "cooldowns": raw_cds,
+            "recharge": recharge
+        })
+    return out
+
+
+# --- LOOKUP (cache -> Meraki -> CDragon) ---
+MERAKI_SOURCE = "Meraki Analytics (Wiki)"
+CDRAGON_SOURCE = "Community Dragon (Raw Client)"
+HEDGE_BUDGET = 0.4  # seconds Meraki gets to answer before a ready CDragon result is used
+
+# Shared so that a source which loses the race can finish in the background
+# without holding up the caller.
+_race_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="source-race")
+
+
+def load_meraki_abilities(champ_slug: str) -> list[dict]:
+    with profiler.stage("meraki", champion=champ_slug) as span:
+        rows = parse_meraki(fetch_meraki_champion(champ_slug))
+        span.args["rows"] = len(rows)
+    return rows
+
+
+def load_cdragon_abilities(champ_slug: str, patch: str) -> list[dict]:
+    with profiler.stage("cdragon", champion=champ_slug) as span:
+        dd_champ = fetch_ddragon_details(champ_slug, patch)
+        if not dd_champ:
+            return []
+        champ_key = int(dd_champ["key"])
+        cd_champ = fetch_cdragon_data(champ_key)
+        if not cd_champ:
+            return []
+        rows = parse_cdragon(dd_champ, cd_champ)
+        span.args["rows"] = len(rows)
+    return rows
+
+
+def get_champion_abilities(champ_slug: str, patch: str, use_cache: bool = True):
+    """
+    Returns (abilities, source_used) for a DDragon champion id.
+    abilities is [] if neither source has data.
+    """
+    if use_cache:
+        cached = get_cached_abilities(champ_slug, patch)
+        if cached:
+            return cached
+
+    abilities = []
+    source_used = "Unknown"
+
+    # 1. TRY MERAKI FIRST
+    parsed = load_meraki_abilities(champ_slug)
+    if parsed:
+        abilities = parsed
+        source_used = MERAKI_SOURCE
+
+    # 2. FALLBACK TO CDRAGON
+    if not abilities:
+        parsed = load_cdragon_abilities(champ_slug, patch)
+        if parsed:
+            abilities = parsed
+            source_used = CDRAGON_SOURCE
+
+    if abilities and use_cache:
+        put_cached_abilities(champ_slug, patch, abilities, source_used)
+    return abilities, source_used
+
+
+def race_champion_sources(champ_slug: str, patch: str, budget: float = HEDGE_BUDGET, use_cache: bool = True):
+    """
+    Hedged variant of get_champion_abilities: Meraki and the DDragon+CDragon chain
+    start at the same time. Meraki is preferred if it answers within `budget` seconds,
+    otherwise the first usable result wins, so a slow or broken source costs at most
+    `budget` instead of its whole timeout.
+
+    Returns (abilities, source_used, timings)
+    timings – {"Meraki": s, "CDragon": s}, None for a source still running when the
+              race was decided; {"cache": s} when served locally
+    """
+    start = time.perf_counter()
+    if use_cache:
+        cached = get_cached_abilities(champ_slug, patch)
+        if cached:
+            return cached[0], cached[1], {"cache": time.perf_counter() - start}
+
+    timings = {"Meraki": None, "CDragon": None}
+
+    def timed(name, fn, *args):
+        try:
+            return fn(*args)
+        except Exception:
+            return []
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    meraki = _race_pool.submit(timed, "Meraki", load_meraki_abilities, champ_slug)
+    cdragon = _race_pool.submit(timed, "CDragon", load_cdragon_abilities, champ_slug, patch)
+    sources = {meraki: MERAKI_SOURCE, cdragon: CDRAGON_SOURCE}
+
+    abilities, source_used = [], "Unknown"
+
+    # 1. Meraki's head start
+    wait([meraki], timeout=budget)
+
+    # 2. After that, take whichever usable result is ready first
+    pending = {meraki, cdragon}
+    while pending:
+        if meraki.done() and meraki.result():
+            winner = meraki
+        else:
+            done = [f for f in (cdragon, meraki) if f.done() and f.result()]
+            winner = done[0] if done else None
+        if winner:
+            abilities, source_used = winner.result(), sources[winner]
+            break
+        pending = {f for f in pending if not f.done()}
+        if pending:
+            wait(pending, return_when=FIRST_COMPLETED)
+
+    if use_cache:
+        if abilities:
+            put_cached_abilities(champ_slug, patch, abilities, source_used)
+        if source_used != MERAKI_SOURCE and not meraki.done():
+            # Meraki lost on time only: let its answer replace the fallback once it lands
+            def upgrade(f):
+                if f.result():
+                    put_cached_abilities(champ_slug, patch, f.result(), MERAKI_SOURCE)
+            meraki.add_done_callback(upgrade)
+
+    return abilities, source_used, dict(timings)
@@ -0,0 +1,146 @@
+import os, json, time, threading
+
+from utils import http_client, profiler
+
+CACHE_DIR = "./cache"
+CACHE_PATH = os.path.join(CACHE_DIR, "ability_cache.json")
+MAX_ENTRIES = 256  # a full roster is ~170 champions, so one patch fits comfortably
+# Meraki only serves "latest" and catches up days after a patch, so its rows are
+# re-fetched after this long; CDragon and DDragon rows hold for the whole patch
+SOURCE_TTL = {"Meraki Analytics (Wiki)": 6 * 60 * 60}  # keyed like utils.abilities.MERAKI_SOURCE
+
+_lock = threading.Lock()
+_state = None  # {"patch": str, "entries": {slug: {"source", "rows", "last_used", "fetched_at"}}, "previous": {"patch", "entries"}}
+
+
+def _patch_order(patch: str | None) -> tuple:
+    """ "15.10.1" -> (15, 10, 1), comparable across patches; None sorts first """
+    return tuple(int(part) if part.isdigit() else 0 for part in patch.split(".")) if patch else ()
+
+
+def _read_state(patch: str) -> dict:
+    global _state
+    if _state is None:
+        try:
+            with open(CACHE_PATH, encoding="utf-8") as f:
+                _state = json.load(f)
+        except (OSError, ValueError):
+            _state = {"patch": patch, "entries": {}}
+    return _state
+
+
+def _load(patch: str) -> dict | None:
+    """ Return the in-memory store for `patch`, reading it from disk on first use.
+        The store only rolls forward: for a patch older than the stored one
+        (a lookup still running from before a patch switch) there is none.
+        A store written for an older patch is kept (once) as "previous" for
+        utils.patch_update to diff against, and is otherwise not served; its
+        entries count against MAX_ENTRIES and are evicted first. """
+    global _state
+    state = _read_state(patch)
+    if state.get("patch") != patch:
+        if _patch_order(patch) < _patch_order(state.get("patch")):
+            return None
+        previous = {"patch": state.get("patch"), "entries": state.get("entries", {})}
+        _state = {"patch": patch, "entries": {}, "previous": previous}
+    return _state
+
+
+def _expired(entry: dict, now: float) -> bool:
+    ttl = SOURCE_TTL.get(entry["source"])
+    return ttl is not None and now - entry.get("fetched_at", 0) > ttl and not http_client.is_offline()
+
+
+def _save(state: dict):
+    entries = state["entries"]
+    previous = (state.get("previous") or {}).get("entries", {})
+    if len(entries) + len(previous) > MAX_ENTRIES:
+        # the previous patch counts against the cap and goes first: it is never served
+        by_age = [(store, slug) for store in (previous, entries)
+                  for slug in sorted(store, key=lambda slug: store[slug]["last_used"])]
+        for store, slug in by_age[:len(entries) + len(previous) - MAX_ENTRIES]:
+            del store[slug]
+        if not previous:
+            state.pop("previous", None)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = CACHE_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, CACHE_PATH)
+
+
+def preload_ability_cache(patch: str):
+    """ Read the cache file now instead of on the first lookup """
+    with _lock:
+        _load(patch)
+
+
+def get_cached_abilities(slug: str, patch: str):
+    """ Return (rows, source) for a champion on `patch`, or None on a miss """
+    with _lock:
+        state = _load(patch)
+        entry = state["entries"].get(slug) if state else None
+        now = time.time()
+        if entry and _expired(entry, now):
+            profiler.cache_event("abilities", "expired")
+            return None  # re-fetched, and replaced by put_cached_abilities()
+        profiler.cache_event("abilities", "hit" if entry else "miss")
+        if not entry:
+            return None
+        # only bumped in memory; persisted with the next write
+        entry["last_used"] = now
+        return entry["rows"], entry["source"]
+
+
+def put_cached_abilities(slug: str, patch: str, rows: list[dict], source: str):
+    put_many_cached_abilities(patch, {slug: (rows, source)})
+
+
+def put_many_cached_abilities(patch: str, items: dict[str, tuple[list[dict], str]]):
+    """ Store several champions with a single disk write.
+        items – {slug: (rows, source)} """
+    if not items:
+        return
+    with _lock:
+        state = _load(patch)
+        if state is None:  # an older patch than the one already stored: dropped
+            return
+        now = time.time()
+        for slug, (rows, source) in items.items():
+            state["entries"][slug] = {"source": source, "rows": rows, "last_used": now, "fetched_at": now}
+        _save(state)
+
+
+def clear_ability_cache():
+    global _state
+    with _lock:
+        _state = None
+        try:
+            os.remove(CACHE_PATH)
+        except OSError:
+            pass
+
+
+def export_abilities(patch: str) -> dict:
+    """ {slug: {"source", "rows", "last_used", "fetched_at"}} stored for `patch` (current or previous), {} if none """
+    with _lock:
+        state = _read_state(patch)
+        for stored in (state, state.get("previous") or {}):
+            if stored.get("patch") == patch:
+                return json.loads(json.dumps(stored["entries"]))
+        return {}
+
+
+def restore_abilities(patch: str, entries: dict):
+    """ Serve `entries` (from export_abilities) for `patch`, in memory only """
+    global _state
+    with _lock:
+        _state = {"patch": patch, "entries": dict(entries)}
+
+
+def cached_champions(patch: str) -> set[str]:
+    """ Slugs that have rows stored for `patch` that are still fresh """
+    with _lock:
+        state, now = _load(patch), time.time()
+        return {slug for slug, entry in state["entries"].items() if not _expired(entry, now)} if state else set()
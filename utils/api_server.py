@@ -0,0 +1,235 @@
+"""
+Local HTTP API over the same lookups as the prompt, for overlays and other tools
+that shouldn't spawn the CLI for every question:
+
+    python fuzzy_cooldown_info_helper.py --serve [PORT]
+
+    GET /cooldowns/{champ}[?haste=N]   ability rows and source, like one --batch record
+    GET /resolve?q=TEXT                best match for TEXT plus the next candidates
+    GET /matchups/{champ}/{role}       u.gg counters: {opponent: {wr, gd15, pickrate, matches}}
+    GET /health                        patch and response-cache counters
+
+{champ} is anything the prompt accepts ("kaisa", "mf", "wukong", typos).
+Everything shares one LookupSession, so the patch, registry, HTTP pool and disk
+caches stay warm. Encoded responses are also kept in memory per patch, and
+concurrent requests for a response that isn't cached yet wait on the one lookup
+in flight instead of each starting their own.
+"""
+import json
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from utils.batch import champion_record
+from utils.champion_registry import normalise
+from utils.dd_champ_names import get_name_index
+from utils.matchup_store import ROLES, save_matchup_stores
+from utils.parse_ugg_ssr import parse_ugg_matchups
+
+API_PORT = 8780
+RESPONSE_CACHE_SIZE = 1024  # encoded responses; a full roster × (cooldowns + 5 roles) fits
+RESOLVE_CANDIDATES = 5
+STORE_SAVE_INTERVAL = 60  # seconds between writes of matchup pages fetched by /matchups
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# --- shared cache ---
+class CoalescingCache:
+    """
+    LRU of computed values with single-flight loading: while one caller runs
+    loader() for a key, everyone else asking for that key waits for its result.
+    Exceptions reach every waiter and are not cached.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.stats = {"hit": 0, "miss": 0, "coalesced": 0}
+        self._entries = OrderedDict()
+        self._inflight = {}  # key -> Future of the running loader
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, loader, cacheable=lambda value: True):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats["hit"] += 1
+                return self._entries[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.stats["miss"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            if cacheable(value):
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+
+def _encode(status: int, payload: dict) -> tuple[int, bytes]:
+    return status, json.dumps(payload, ensure_ascii=False).encode()
+
+
+# --- server ---
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # listen backlog; the default 5 drops connects in a burst and costs a 1s SYN retry
+
+    def __init__(self, session, fetch, address=("127.0.0.1", API_PORT)):
+        """ fetch – get_champion_abilities or race_champion_sources """
+        super().__init__(address, _ApiHandler)
+        self.session = session
+        self.fetch = fetch
+        self.cache = CoalescingCache()
+        self._saved_at = time.monotonic()
+
+    def service_actions(self):
+        """ Between serve_forever() polls: write newly fetched matchup pages, at most every STORE_SAVE_INTERVAL """
+        if time.monotonic() - self._saved_at >= STORE_SAVE_INTERVAL:
+            self._saved_at = time.monotonic()
+            save_matchup_stores()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, segments: list[str], params: dict) -> tuple[int, bytes]:
+        """ (status, JSON body) for a request path split on "/" and its query parameters """
+        patch, registry = self.session.current()
+        endpoint, args = (segments[0], segments[1:]) if segments else ("", [])
+        if endpoint == "cooldowns" and len(args) == 1:
+            haste = self._float(params, "haste")
+            champ = self._resolve(patch, registry, args[0])
+            return self.cache.get(("cooldowns", patch, champ.id, haste),
+                                  lambda: self._cooldowns(champ, patch, haste), _cacheable)
+        if endpoint == "resolve" and not args:
+            query = params.get("q", [""])[0]
+            if not query.strip():
+                raise ApiError(400, "missing ?q=")
+            return self.cache.get(("resolve", patch, normalise(query)),
+                                  lambda: self._resolve_response(patch, registry, query), _cacheable)
+        if endpoint == "matchups" and len(args) == 2:
+            champ, role = self._resolve(patch, registry, args[0]), args[1]
+            if role not in ROLES:
+                raise ApiError(400, f"role must be one of {', '.join(ROLES)}")
+            return self.cache.get(("matchups", patch, champ.id, role),
+                                  lambda: self._matchups(champ, role), _cacheable)
+        if endpoint == "health" and not args:
+            return _encode(200, {"patch": patch, "cached": len(self.cache), "cache": self.cache.stats})
+        raise ApiError(404, "unknown endpoint; try /cooldowns/{champ}, /resolve?q=, /matchups/{champ}/{role}")
+
+    @staticmethod
+    def _float(params: dict, name: str) -> float | None:
+        try:
+            return float(params[name][0]) if name in params else None
+        except ValueError:
+            raise ApiError(400, f"{name} must be a number")
+
+    def _resolve(self, patch, registry, raw: str):
+        """ Champion for `raw`; the resolution itself is cached like a response """
+        def load():
+            try:
+                return registry.resolve(raw)
+            except (ValueError, KeyError):
+                return None
+
+        champ = self.cache.get(("champion", patch, normalise(raw)), load)
+        if champ is None:
+            raise ApiError(404, f"no champion matches '{raw}'")
+        return champ
+
+    def _cooldowns(self, champ, patch, haste) -> tuple[int, bytes]:
+        record = champion_record(champ, patch, self.fetch, haste)
+        return _encode(502 if "error" in record else 200, record)
+
+    def _resolve_response(self, patch, registry, query: str) -> tuple[int, bytes]:
+        try:
+            champ = registry.resolve(query)
+        except (ValueError, KeyError):
+            return _encode(404, {"query": query, "error": "no matching champion"})
+        candidates = [
+            {"id": champ_id, "name": registry.by_id(champ_id).name, "distance": dist}
+            for champ_id, dist in get_name_index(registry.name_map).candidates(query, RESOLVE_CANDIDATES)
+        ]
+        return _encode(200, {
+            "query": query, "patch": patch,
+            "champion": {"id": champ.id, "key": champ.key, "name": champ.name},
+            "candidates": candidates,
+        })
+
+    def _matchups(self, champ, role: str) -> tuple[int, bytes]:
+        try:
+            matchups = parse_ugg_matchups({"slug": champ.slug}, role)
+        except Exception as e:
+            return _encode(502, {"champion": champ.id, "role": role, "error": f"{type(e).__name__}: {e}"})
+        return _encode(200, {"champion": champ.id, "name": champ.name, "role": role, "matchups": matchups})
+
+
+def _cacheable(response: tuple[int, bytes]) -> bool:
+    """ Upstream failures (5xx) are retried by the next request; everything else holds for the patch """
+    return response[0] < 500
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive for overlays polling every few seconds
+    disable_nagle_algorithm = True  # headers and body go out as separate writes; don't hold the body for an ACK
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        segments = [unquote(s) for s in parts.path.split("/") if s]
+        try:
+            status, body = self.server.respond(segments, parse_qs(parts.query))
+        except ApiError as e:
+            status, body = _encode(e.status, {"error": str(e)})
+        except Exception as e:
+            status, body = _encode(500, {"error": f"{type(e).__name__}: {e}"})
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")  # browser-source overlays
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(session, fetch, port: int = API_PORT):
+    server = ApiServer(session, fetch, ("127.0.0.1", port))
+    print(f"Serving cooldown lookups on {server.url} (patch {session.patch}); Ctrl+C to stop")
+    print(f"  {server.url}/cooldowns/vi   {server.url}/resolve?q=kaisa   {server.url}/matchups/vi/jungle")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\ncache: {server.cache.stats}")
+    finally:
+        server.server_close()
+        save_matchup_stores()
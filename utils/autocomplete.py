@@ -0,0 +1,183 @@
+"""
+As-you-type champion prompt. Every keystroke re-ranks the candidates of each
+"+"-separated name with the fuzzy name index and shows the best few after the
+cursor (Tab takes the first). Once a name's top candidate has held still for
+PREFETCH_DELAY, its abilities start downloading, so the table is usually ready
+when Enter is pressed. When the top candidate changes, its queued download is
+cancelled.
+"""
+import os
+import sys
+import shutil
+import threading
+
+from utils import profiler
+from utils.dd_champ_names import get_name_index
+
+PREFETCH_DELAY = 0.15  # seconds a candidate must stay on top before it's fetched; skips mid-word flicker
+HINT_COUNT = 3
+
+DIM, RESET, CLEAR_LINE = "\x1b[2m", "\x1b[0m", "\x1b[K"
+
+
+def raw_terminal_available() -> bool:
+    """ Same test as wait_for_enter_only(): IDE run consoles can't do keypress input """
+    return (
+        sys.stdin.isatty() and sys.stdout.isatty()
+        and "PYCHARM_HOSTED" not in os.environ and "VSCODE_PID" not in os.environ
+    )
+
+
+# --- speculative fetches ---
+class SpeculativePrefetcher:
+    """
+    Runs fetch(slug) on `pool` for the champions the user is probably about to
+    submit. want() is called with the current top candidates on every keystroke;
+    take() hands the in-flight future to the real lookup.
+    """
+
+    def __init__(self, pool, fetch, delay: float = PREFETCH_DELAY):
+        self.pool = pool
+        self.fetch = fetch
+        self.delay = delay
+        self.stats = {"started": 0, "cancelled": 0, "used": 0}
+        self._wanted = set()
+        self._timers = {}   # slug -> Timer, waiting out the delay
+        self._futures = {}  # slug -> Future, queued or running
+        self._lock = threading.Lock()
+
+    def want(self, slugs):
+        with self._lock:
+            self._wanted = set(slugs)
+            for slug in list(self._timers):
+                if slug not in self._wanted:
+                    self._timers.pop(slug).cancel()
+            for slug in list(self._futures):
+                # a running fetch can't be stopped; it is kept in case the candidate comes back
+                if slug not in self._wanted and self._futures[slug].cancel():
+                    del self._futures[slug]
+                    self.stats["cancelled"] += 1
+            for slug in self._wanted - self._timers.keys() - self._futures.keys():
+                timer = threading.Timer(self.delay, self._start, (slug,))
+                timer.daemon = True
+                self._timers[slug] = timer
+                timer.start()
+
+    def _start(self, slug: str):
+        with self._lock:
+            if self._timers.pop(slug, None) is None or slug not in self._wanted:
+                return
+            self._futures[slug] = self.pool.submit(self.fetch, slug)
+            self.stats["started"] += 1
+
+    def take(self, slug: str):
+        """ The speculative future for `slug` (now the caller's), or None if it was never started """
+        with self._lock:
+            future = self._futures.pop(slug, None)
+        profiler.cache_event("speculative prefetch", "hit" if future else "miss")
+        if future:
+            self.stats["used"] += 1
+        return future
+
+    def close(self):
+        """ Drop whatever wasn't taken """
+        self.want(())
+
+
+# --- line editor ---
+def read_line(prompt: str, on_change=None) -> str:
+    """
+    input() with a live hint after the cursor. on_change(text) is called after
+    every edit and returns (hint, completion): the dimmed text to show and what
+    Tab replaces the last "+"-separated name with (None for nothing).
+    Handles printable keys, Backspace, Ctrl+U, Ctrl+W, Tab and Enter.
+    """
+    text, completion = "", None
+
+    def redraw(hint=""):
+        line = prompt + text
+        room = shutil.get_terminal_size().columns - len(line) - 3
+        hint = hint[:room] if room > 0 else ""
+        out = f"\r{CLEAR_LINE}{line}"
+        if hint:
+            out += f"  {DIM}{hint}{RESET}\x1b[{len(hint) + 2}D"
+        sys.stdout.write(out)
+        sys.stdout.flush()
+
+    def edited():
+        nonlocal completion
+        hint, completion = on_change(text) if on_change else ("", None)
+        redraw(hint)
+
+    if os.name == "nt":
+        import msvcrt
+        os.system("")  # turns on ANSI escape handling in the Windows console
+        read_key = msvcrt.getwch
+        restore = None
+    else:
+        import termios
+        import tty
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        tty.setcbreak(fd)  # keys one at a time, no echo, Ctrl+C still interrupts
+        read_key = lambda: sys.stdin.read(1)
+        restore = lambda: termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+    try:
+        redraw()
+        while True:
+            key = read_key()
+            if key in ("\r", "\n"):
+                break
+            if key == "\x03":  # Windows delivers Ctrl+C as a key
+                raise KeyboardInterrupt
+            if key in ("\x04", "\x1a") and not text:  # Ctrl+D / Ctrl+Z on an empty line, like input()
+                raise EOFError
+            if key in ("\x00", "\xe0"):  # Windows arrow / function key prefix
+                read_key()
+                continue
+            if key == "\x1b":  # ANSI escape sequence (arrows, Delete, ...): skip it
+                if read_key() == "[":
+                    while not "@" <= read_key() <= "~":
+                        pass
+                continue
+            if key in ("\x7f", "\x08"):
+                text = text[:-1]
+            elif key == "\x15":  # Ctrl+U
+                text = ""
+            elif key == "\x17":  # Ctrl+W
+                text = text.rstrip()
+                text = text[:max(text.rfind(" "), text.rfind("+")) + 1]
+            elif key == "\t":
+                if not completion:
+                    continue
+                head, plus, _ = text.rpartition("+")
+                text = f"{head}{plus} {completion}" if plus else completion
+            elif key.isprintable():
+                text += key
+            else:
+                continue
+            edited()
+    finally:
+        if restore:
+            restore()
+    redraw()
+    sys.stdout.write("\n")
+    return text
+
+
+def autocomplete_input(prompt: str, registry, prefetcher: SpeculativePrefetcher | None = None) -> str:
+    """ read_line() with champion hints from `registry`, prefetching each name's top candidate """
+    index = get_name_index(registry.name_map)
+
+    def on_change(text):
+        ranked = [index.candidates(part, limit=HINT_COUNT) if part.strip() else [] for part in text.split("+")]
+        if prefetcher:
+            prefetcher.want(found[0][0] for found in ranked if found)
+        current = ranked[-1]
+        if not current:
+            return "", None
+        names = [registry.by_id(champ_id).name for champ_id, _ in current]
+        return " · ".join(names), names[0]
+
+    return read_line(prompt, on_change)
@@ -0,0 +1,154 @@
+"""
+Non-interactive lookups: champion queries from arguments, a file or stdin are
+resolved and fetched concurrently, and each result is written out as NDJSON or
+CSV as soon as it completes (so in completion order, not input order).
+
+    python fuzzy_cooldown_info_helper.py --batch Vi Gnar "Kai'Sa"
+    python fuzzy_cooldown_info_helper.py --batch-file champion_pool.txt --format csv
+    cat names.txt | python fuzzy_cooldown_info_helper.py --batch-file - > cooldowns.ndjson
+
+Queries are read lazily and at most BATCH_IN_FLIGHT are pending at once, so
+neither the input nor the results are ever held in full.
+"""
+import sys
+import csv
+import json
+import time
+import threading
+
+BATCH_WORKERS = 16    # matches http_client.POOL_MAXSIZE, the keep-alive sockets per host
+BATCH_IN_FLIGHT = 32  # queries resolved and queued ahead of the slowest pending fetch
+FORMATS = ("ndjson", "csv")  # mirrored in the main script's --format
+CSV_FIELDS = ("query", "champion", "name", "patch", "source", "key", "ability", "cooldowns", "recharge", "error")
+
+
+def read_queries(queries=(), path: str | None = None):
+    """
+    Yield queries from `queries`, then from `path` ("-" is stdin), one per line,
+    skipping blanks and #comments like champion_pool.txt. "Vi + Gnar" is two queries.
+    """
+    def lines():
+        yield from queries
+        if path == "-":
+            yield from sys.stdin
+        elif path:
+            with open(path, encoding="utf-8") as f:
+                yield from f
+
+    for line in lines():
+        if line.strip().startswith("#"):
+            continue
+        for query in line.split("+"):
+            if query.strip():
+                yield query.strip()
+
+
+class _NDJSONWriter:
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, record: dict):
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.out.flush()
+
+
+class _CSVWriter:
+    """ One row per ability; a query without data is one row with only the error filled in """
+
+    def __init__(self, out):
+        self.out = out
+        self.writer = csv.DictWriter(out, CSV_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, record: dict):
+        base = {f: record.get(f) for f in ("query", "champion", "name", "patch", "source", "error")}
+        if not record.get("abilities"):
+            self.writer.writerow(base)
+        for row in record.get("abilities", ()):
+            self.writer.writerow({
+                **base, "key": row["key"], "ability": row["name"],
+                "cooldowns": ";".join(f"{v:g}" for v in row["cooldowns"]),
+                "recharge": ";".join(f"{v:g}" for v in row["recharge"]),
+            })
+        self.out.flush()
+
+
+def champion_record(champ, patch: str, fetch, haste: float | None = None) -> dict:
+    """ A resolved champion's output record: its ability rows and source, or an error (shared with utils.api_server) """
+    record = {"champion": champ.id, "name": champ.name, "patch": patch, "source": None}
+    try:
+        abilities, source = fetch(champ.id, patch)[:2]
+    except Exception as e:
+        return {**record, "error": f"{type(e).__name__}: {e}"}
+    if not abilities:
+        return {**record, "error": "no ability data in either source"}
+    if haste:
+        from utils.haste import apply_haste
+        abilities = apply_haste(abilities, haste)
+        record["haste"] = haste
+    record.update(source=source, abilities=[
+        {"key": a["key"], "name": a["name"], "cooldowns": a["cooldowns"], "recharge": a["recharge"]}
+        for a in abilities
+    ])
+    return record
+
+
+def _lookup(query: str, registry, patch: str, fetch, haste: float | None) -> dict:
+    """ One query's output record """
+    try:
+        champ = registry.resolve(query)
+    except (ValueError, KeyError):
+        return {"query": query, "champion": None, "name": None, "patch": patch, "source": None,
+                "error": "no matching champion"}
+    return {"query": query, **champion_record(champ, patch, fetch, haste)}
+
+
+def run_batch(queries, session, fetch, out=None, fmt: str = "ndjson", haste: float | None = None,
+              in_flight: int = BATCH_IN_FLIGHT, progress=None) -> dict:
+    """
+    Look up every query on the session's workers and write each record to `out`
+    (default stdout) the moment it completes, even while later queries are still
+    being read.
+
+    fetch – get_champion_abilities or race_champion_sources
+    Returns stats: queries, failed, seconds
+    """
+    start = time.perf_counter()
+    out = out or sys.stdout
+    writer = _NDJSONWriter(out) if fmt == "ndjson" else _CSVWriter(out)
+    patch, registry = session.current()
+    stats = {"queries": 0, "failed": 0, "seconds": 0.0}
+    write_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(in_flight)
+
+    broken = []  # the writer's exception (e.g. BrokenPipeError once `| head` exits); nothing is written after it
+
+    def emit(future):
+        try:
+            record = future.result()  # _lookup turns every failure into an error record
+            with write_lock:
+                if broken:
+                    return
+                stats["failed"] += "error" in record
+                writer.write(record)
+        except BaseException as e:
+            broken.append(e)
+        finally:
+            slots.release()  # always, or the drain below waits forever
+
+    for query in queries:
+        slots.acquire()
+        if broken:
+            slots.release()
+            break
+        session.pool.submit(_lookup, query, registry, patch, fetch, haste).add_done_callback(emit)
+        stats["queries"] += 1
+    for _ in range(in_flight):  # every slot back means every record is written (or dropped after a failure)
+        slots.acquire()
+    if broken:
+        raise broken[0]
+
+    stats["seconds"] = time.perf_counter() - start
+    if progress:
+        progress(f"{stats['queries']} queries in {stats['seconds']:.2f}s, {stats['failed']} without data")
+    return stats
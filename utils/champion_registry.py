@@ -0,0 +1,177 @@
+import os
+import re
+import json
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from utils import http_client, profiler
+from utils.dd_champ_names import build_ddragon_champion_map, get_name_index
+
+DDRAGON_CHAMPIONS_URL = "https://ddragon.leagueoflegends.com/cdn/{patch}/data/en_US/champion.json"
+# the SEO nickname block u.gg embeds in every page, available on its own
+SEO_NAMES_URL = "https://static.bigbrain.gg/assets/lol/riot_patch_update/prod/seo-champion-names.json"
+REGISTRY_CACHE_PATH = "./cache/champion_registry.json"
+
+
+def normalise(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+@dataclass(frozen=True)
+class Champion:
+    key: int                  # numeric key, e.g. 266 (u.gg / CDragon / LCU champion_id)
+    id: str                   # DDragon id and filename, e.g. "MonkeyKing"
+    name: str                 # display name, e.g. "Wukong"
+    aliases: tuple[str, ...]  # display name, SEO nicknames, ...
+
+    @property
+    def slug(self) -> str:
+        """ u.gg / Meraki style lowercase slug """
+        return self.id.lower()
+
+
+class ChampionRegistry:
+    """
+    Every champion identity for one patch, with O(1) lookups by numeric key,
+    DDragon id, slug and normalised alias. Immutable once built.
+    """
+
+    def __init__(self, patch: str, champions):
+        self.patch = patch
+        self.champions = tuple(champions)  # DDragon order, which fuzzy ties are broken by
+
+        by_alias = {}
+        for champ in self.champions:
+            for alias in (champ.name, champ.id, *champ.aliases):
+                by_alias.setdefault(normalise(alias), champ)
+
+        self._by_key = MappingProxyType({c.key: c for c in self.champions})
+        self._by_id = MappingProxyType({c.id: c for c in self.champions})
+        self._by_slug = MappingProxyType({c.slug: c for c in self.champions})
+        self._by_alias = MappingProxyType(by_alias)
+        # load_ddragon_champion_map()-compatible name → id map, in DDragon order
+        self.name_map = MappingProxyType(build_ddragon_champion_map(
+            {c.id: {"id": c.id, "name": c.name} for c in self.champions}
+        ))
+
+    def __len__(self):
+        return len(self.champions)
+
+    def by_key(self, key) -> Champion | None:
+        return self._by_key.get(int(key))
+
+    def by_id(self, champ_id: str) -> Champion | None:
+        return self._by_id.get(champ_id)
+
+    def by_slug(self, slug: str) -> Champion | None:
+        return self._by_slug.get(slug.lower())
+
+    def by_alias(self, alias: str) -> Champion | None:
+        return self._by_alias.get(normalise(alias))
+
+    def name_of(self, key) -> str:
+        champ = self.by_key(key)
+        return champ.name if champ else f"#{key}"
+
+    def resolve(self, raw: str) -> Champion:
+        """ Alias hit first, then the fuzzy DDragon name index. Raises ValueError """
+        champ = self.by_alias(raw)
+        if champ:
+            return champ
+        return self._by_id[get_name_index(self.name_map).lookup(raw)]
+
+    def to_json(self) -> dict:
+        return {
+            "patch": self.patch,
+            "champions": [
+                {"key": c.key, "id": c.id, "name": c.name, "aliases": list(c.aliases)}
+                for c in self.champions
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ChampionRegistry":
+        return cls(data["patch"], [
+            Champion(c["key"], c["id"], c["name"], tuple(c["aliases"])) for c in data["champions"]
+        ])
+
+
+def build_registry(patch: str, champion_data: dict, seo_data: dict | None) -> ChampionRegistry:
+    """
+    champion_data – "data" block of DDragon's champion.json
+    seo_data      – u.gg's seo-champion-names.json data block, keyed by numeric key
+    """
+    champions = []
+    for info in champion_data.values():
+        aliases = {info["name"]}
+        seo_info = (seo_data or {}).get(info["key"])
+        if seo_info:
+            for k in ("name", "altName", "altName2"):
+                alt = seo_info.get(k)
+                if alt:
+                    aliases.add(alt)
+        champions.append(Champion(int(info["key"]), info["id"], info["name"], tuple(sorted(aliases))))
+    return ChampionRegistry(patch, champions)
+
+
+def _fetch_seo_names() -> dict | None:
+    try:
+        r = http_client.get(SEO_NAMES_URL)
+        if r.status_code == 200:
+            data = r.json()
+            # served either bare or wrapped like the SSR block
+            return data.get("data", data) if isinstance(data, dict) else None
+    except Exception:
+        pass
+    return None
+
+
+def _read_cache(patch: str) -> ChampionRegistry | None:
+    try:
+        with open(REGISTRY_CACHE_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("patch") == patch:
+            return ChampionRegistry.from_json(data)
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _write_cache(registry: ChampionRegistry):
+    os.makedirs(os.path.dirname(REGISTRY_CACHE_PATH), exist_ok=True)
+    with open(REGISTRY_CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump(registry.to_json(), f, ensure_ascii=False)
+
+
+_registries = {}  # patch -> ChampionRegistry
+_registry_lock = threading.Lock()
+
+
+def register_registry(registry: ChampionRegistry):
+    """ Make `registry` the answer for its patch for the rest of the process """
+    with _registry_lock:
+        _registries[registry.patch] = registry
+
+
+def load_champion_registry(patch: str) -> ChampionRegistry:
+    """ Registry for `patch`: memoized per process, cached on disk, else built from DDragon + u.gg SEO names """
+    registry = _registries.get(patch)
+    if registry is not None:
+        profiler.cache_event("registry", "hit")
+        return registry
+
+    with _registry_lock:
+        registry = _registries.get(patch)
+        if registry is None:
+            registry = _read_cache(patch)
+            profiler.cache_event("registry", "disk" if registry is not None else "miss")
+        if registry is None:
+            r = http_client.get(DDRAGON_CHAMPIONS_URL.format(patch=patch))
+            r.raise_for_status()
+            seo_data = _fetch_seo_names()
+            registry = build_registry(patch, r.json()["data"], seo_data)
+            if seo_data is not None:  # retry the aliases next run rather than pinning a partial registry
+                _write_cache(registry)
+        _registries[patch] = registry
+    return registry
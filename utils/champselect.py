@@ -0,0 +1,114 @@
+import json
+import time
+import threading
+
+from utils.abilities import get_champion_abilities
+from utils.champion_registry import load_champion_registry
+
+POLL_INTERVAL = 0.25  # seconds between session reads while in champ select
+IDLE_INTERVAL = 2.0   # seconds between reads while waiting for one to start
+PICK_WORKERS = 5      # one per enemy; the watcher's pool, shared by every champ select
+
+
+def enemy_champion_ids(session: dict) -> list[int]:
+    """
+    Champion ids the enemy team has locked in, in pick order.
+    theirTeam only shows a champion once it's locked (hovers stay 0), completed
+    enemy pick actions cover the modes where theirTeam lags behind.
+    """
+    ids = [member.get("championId", 0) for member in session.get("theirTeam", [])]
+    for turn in session.get("actions", []):
+        for action in turn:
+            if action.get("type") == "pick" and action.get("completed") and not action.get("isAllyAction"):
+                ids.append(action.get("championId", 0))
+    return [champion_id for champion_id in dict.fromkeys(ids) if champion_id > 0]
+
+
+def watch_champ_select(client, on_pick, interval: float = POLL_INTERVAL, stop: threading.Event | None = None,
+                       recording: list | None = None):
+    """
+    Follow one champ select: wait for it to start, call on_pick(champion_id, seen_at)
+    once for every new enemy pick (seen_at is time.perf_counter() of the read that
+    showed it) and return the set of picks when the session ends.
+
+    The client also pushes these updates over a websocket (WAMP), but that needs a
+    websocket package; polling the REST endpoint every `interval` seconds costs at
+    most that much latency per pick.
+
+    recording – if a list, every session read is appended as {"at", "session"}
+                (seconds since the first one), the format utils.lcu_replay serves
+    """
+    seen = set()
+    in_session = False
+    first_read = None
+    while not (stop and stop.is_set()):
+        session = client.champ_select_session()
+        now = time.perf_counter()
+        if session is None:
+            if in_session:
+                break
+            time.sleep(IDLE_INTERVAL)
+            continue
+
+        in_session = True
+        if recording is not None:
+            first_read = first_read or now
+            recording.append({"at": round(now - first_read, 3), "session": session})
+        for champion_id in enemy_champion_ids(session):
+            if champion_id not in seen:
+                seen.add(champion_id)
+                on_pick(champion_id, now)
+        time.sleep(interval)
+    return seen
+
+
+def save_recording(recording: list, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"frames": recording}, f)
+
+
+class PickPrefetcher:
+    """
+    Fetches (cache first) and renders each enemy pick as soon as it's seen and
+    keeps how long every pick took from being seen to its table being on screen.
+    One per champ select; `pool` belongs to the caller and outlives it.
+    """
+
+    def __init__(self, patch: str, render, pool):
+        self.patch = patch
+        self.registry = load_champion_registry(patch)
+        self.render = render
+        self.ready = {}  # champion name -> seconds from pick seen to table rendered
+        self._pool = pool
+        self._futures = []
+        self._render_lock = threading.Lock()
+
+    def on_pick(self, champion_id: int, seen_at: float):
+        champ = self.registry.by_key(champion_id)
+        if champ is None:
+            print(f"Enemy locked unknown champion #{champion_id}")
+            return
+        self._futures.append(self._pool.submit(self._fetch_and_render, champ, seen_at))
+
+    def _fetch_and_render(self, champ, seen_at: float):
+        try:
+            abilities, _source = get_champion_abilities(champ.id, self.patch)
+        except Exception as e:
+            print(f"\nError: {champ.name}: {e}")
+            return
+        with self._render_lock:  # one table at a time, picks can land in the same poll
+            print("\n" + "=" * 60)
+            print(f"Enemy locked {champ.name}")
+            self.render(champ.id, abilities)
+            self.ready[champ.name] = time.perf_counter() - seen_at
+
+    def wait(self):
+        for future in self._futures:
+            future.result()
+        self._futures.clear()
+
+    def report(self) -> str:
+        """ e.g. "pick → table: Vi 0.02s, Gnar 0.41s" """
+        if not self.ready:
+            return "no enemy picks seen"
+        return "pick → table: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.ready.items())
@@ -0,0 +1,188 @@
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.fetch_ugg import fetch_champ_counter_ugg
+from utils.page_cache import page_cache_stats
+from utils.parse_ugg_ssr import load_ssr
+from utils.patch import get_effective_patch
+from utils.champion_registry import load_champion_registry
+from utils.matchup_store import load_matchup_store, ROLES
+
+CHAMPION_POOL_PATH = "champion_pool.txt"
+CRAWL_RATE = 4.0         # requests per second, sustained
+CRAWL_BURST = 4          # requests allowed back to back
+CRAWL_CONCURRENCY = 8    # upper bound for in-flight requests
+CRAWL_ATTEMPTS = 3
+CRAWL_MAX_BACKOFF = 60.0  # seconds; longer Retry-After values are clamped to this
+BACKOFF_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """ Allows `rate` acquisitions per second on average, up to `burst` at once """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit: +1 slot per `limit` successes, halved on a
+    429/5xx, never below 1 or above `maximum`.
+    """
+
+    def __init__(self, initial: int, maximum: int):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def success(self):
+        with self._cond:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def backoff(self):
+        with self._cond:
+            self.limit = max(1.0, self.limit / 2)
+
+
+def retry_delay(response, attempt: int) -> float:
+    """ Seconds to wait before the next attempt: the response's Retry-After (seconds or HTTP date), else 2**attempt,
+        at most CRAWL_MAX_BACKOFF """
+    value = (response.headers.get("Retry-After", "") if response is not None else "").strip()
+    if value.isdigit():
+        delay = float(value)
+    else:
+        try:
+            delay = max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            delay = float(2 ** attempt)
+    return min(delay, CRAWL_MAX_BACKOFF)
+
+
+def read_champion_pool(path: str = CHAMPION_POOL_PATH) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def crawl_matchups(
+        champions: list[str],
+        roles=ROLES,
+        rate: float = CRAWL_RATE,
+        concurrency: int = CRAWL_CONCURRENCY,
+        progress=print,
+) -> dict:
+    """
+    Fetch the u.gg counter page of every champion × role concurrently, under a
+    token-bucket rate limit and an adaptive concurrency limit that halves on
+    429/5xx or a timeout. Pages are fetched without the HTTP client's own
+    retries, so every such response reaches the limit at once, and the wait
+    before the next attempt (Retry-After) is taken here, outside the limit.
+    Each page goes through the page cache and straight into the patch's
+    matchup store, which is saved once at the end.
+
+    champions – names as typed (resolved through the champion registry)
+    Returns stats: pages, blocks, failed, seconds, page_cache (this crawl's hits/misses/... and the cache size after it)
+    """
+    from requests import HTTPError, ConnectionError as RequestConnectionError, Timeout
+
+    say = progress or (lambda _msg: None)
+    start = time.perf_counter()
+    cache_before = page_cache_stats()
+    patch = get_effective_patch()
+    registry = load_champion_registry(patch)
+    store = load_matchup_store(patch)
+
+    slugs = []
+    for name in champions:
+        try:
+            slugs.append(registry.resolve(name).slug)
+        except ValueError:
+            say(f"  skipping unknown champion '{name}'")
+    jobs = [(slug, role) for slug in dict.fromkeys(slugs) for role in roles]
+
+    bucket = TokenBucket(rate, CRAWL_BURST)
+    limit = AdaptiveLimit(min(CRAWL_BURST, concurrency), concurrency)
+    stats = {"pages": 0, "blocks": 0, "failed": [], "seconds": 0.0}
+
+    def crawl(slug, role):
+        for attempt in range(CRAWL_ATTEMPTS):
+            bucket.acquire()
+            with limit:
+                try:
+                    html = fetch_champ_counter_ugg(slug, role, use_cache=True, retries=False)
+                except HTTPError as e:
+                    status = e.response.status_code if e.response is not None else None
+                    if status not in BACKOFF_STATUS:
+                        raise
+                    limit.backoff()
+                    delay = retry_delay(e.response, attempt)
+                except (RequestConnectionError, Timeout):
+                    limit.backoff()
+                    delay = min(2 ** attempt, CRAWL_MAX_BACKOFF)
+                else:
+                    limit.success()
+                    return store.ingest_ssr(load_ssr(html))
+            if attempt < CRAWL_ATTEMPTS - 1:  # no point waiting after the last one
+                time.sleep(delay)
+        raise RuntimeError(f"gave up after {CRAWL_ATTEMPTS} attempts")
+
+    say(f"Crawling {len(jobs)} pages ({len(jobs) // max(len(roles), 1)} champions × {len(roles)} roles) for patch {patch}...")
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(crawl, slug, role): (slug, role) for slug, role in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            slug, role = futures[future]
+            try:
+                blocks = future.result()
+                stats["pages"] += 1
+                stats["blocks"] += blocks
+                say(f"  [{done:>3}/{len(jobs)}] {slug} {role}: {blocks} blocks (concurrency {int(limit.limit)})")
+            except Exception as e:
+                stats["failed"].append(f"{slug}/{role}")
+                say(f"  [{done:>3}/{len(jobs)}] {slug} {role}: failed ({e})")
+
+    if store.dirty:
+        store.save()
+    stats["seconds"] = time.perf_counter() - start
+    cache = page_cache_stats()
+    for counter in ("hits", "misses", "revalidated", "evicted"):
+        cache[counter] -= cache_before[counter]
+    stats["page_cache"] = cache
+    say(
+        f"Done: {stats['pages']} pages, {stats['blocks']} blocks in {stats['seconds']:.1f}s "
+        f"({stats['pages'] / stats['seconds']:.1f} pages/s); page cache: {cache['hits']} hits, "
+        f"{cache['revalidated']} revalidated, {cache['misses']} misses, {cache['evicted']} evicted, "
+        f"{cache['pages']} pages / {cache['bytes'] / 1e6:.1f} MB"
+        + (f", failed: {', '.join(stats['failed'])}" if stats["failed"] else "")
+    )
+    return stats
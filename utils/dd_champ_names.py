@@ -1,10 +1,16 @@
-import requests
-import json
+import threading
+
+FUZZY_MAX_DIST = 3  # accept only if reasonably close
+
 
 def load_ddragon_champion_map(patch: str):
-    url = f"https://ddragon.leagueoflegends.com/cdn/{patch}/data/en_US/champion.json"
-    data = requests.get(url).json()["data"]
+    """ name → id map for `patch`, taken from the (cached) champion registry """
+    from utils.champion_registry import load_champion_registry  # the registry builds on this module
+    return load_champion_registry(patch).name_map
+
 
+def build_ddragon_champion_map(data: dict) -> dict[str, str]:
+    """ name → id map from the "data" block of DDragon's champion.json """
     # main name → id
     name_to_id = {}
 
@@ -36,7 +42,134 @@ def levenshtein(a, b):
     return prev[-1]
 
 
+def bounded_levenshtein(a, b, max_dist):
+    """ levenshtein(a, b) if it is <= max_dist, otherwise max_dist + 1 (stops as soon as it knows) """
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) == 0:
+        return len(a)
+
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        curr = [i]
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            curr.append(min(prev[j] + 1, curr[j - 1] + 1, prev[j - 1] + cost))
+        # every later row is >= this row's minimum
+        if min(curr) > max_dist:
+            return max_dist + 1
+        prev = curr
+    return min(prev[-1], max_dist + 1)
+
+
+def _deletions(word: str, max_dist: int) -> set[str]:
+    """ word plus every string reachable by deleting up to max_dist characters """
+    out = {word}
+    frontier = {word}
+    for _ in range(max_dist):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        out |= frontier
+    return out
+
+
+class ChampionNameIndex:
+    """
+    Prebuilt lookup over a load_ddragon_champion_map() name map.
+
+    Same resolution order as the old linear fuzzy_dd_lookup: exact key, then the
+    first key (in map order) containing the input, then the smallest edit distance
+    <= max_dist. The fuzzy step uses a symmetric-deletion index: two strings within
+    edit distance d always share a string reachable from both by <= d deletions, so
+    only keys sharing such a deletion variant with the query are ever compared, and
+    those with a bounded (early-exit) Levenshtein.
+    """
+
+    def __init__(self, name_map: dict[str, str], max_dist: int = FUZZY_MAX_DIST):
+        self.name_map = name_map
+        self.max_dist = max_dist
+        self.keys = list(name_map)  # map order is the tie-breaker
+        self._deletes = {}
+        for pos, key in enumerate(self.keys):
+            for variant in _deletions(key, max_dist):
+                self._deletes.setdefault(variant, []).append(pos)
+
+    def candidates(self, raw: str, limit: int = 5) -> list[tuple[str, int]]:
+        """
+        Ranked [(champion id, edit distance), ...], best first, without duplicates.
+        Substring hits rank before fuzzy hits, like fuzzy_dd_lookup.
+        """
+        key = raw.lower().replace(" ", "")
+        ranked = []
+
+        # exact
+        if key in self.name_map:
+            ranked.append((self.name_map[key], 0))
+
+        # substring (a plain C-level scan over ~200 short keys)
+        ranked += [(self.name_map[k], len(k) - len(key)) for k in self.keys if key in k and k != key]
+
+        if len({champ_id for champ_id, _ in ranked}) >= limit:
+            return self._dedupe(ranked, limit)
+
+        # fuzzy
+        positions = set()
+        for variant in _deletions(key, self.max_dist):
+            positions.update(self._deletes.get(variant, ()))
+        fuzzy = []
+        for pos in positions:
+            dist = bounded_levenshtein(key, self.keys[pos], self.max_dist)
+            if dist <= self.max_dist:
+                fuzzy.append((dist, pos))
+        ranked += [(self.name_map[self.keys[pos]], dist) for dist, pos in sorted(fuzzy)]
+        return self._dedupe(ranked, limit)
+
+    @staticmethod
+    def _dedupe(ranked, limit):
+        out, seen = [], set()
+        for champ_id, dist in ranked:
+            if champ_id not in seen:
+                seen.add(champ_id)
+                out.append((champ_id, dist))
+                if len(out) >= limit:
+                    break
+        return out
+
+    def lookup(self, raw: str) -> str:
+        found = self.candidates(raw, limit=1)
+        if not found:
+            raise ValueError(f"No DDragon match for '{raw}'")
+        return found[0][0]
+
+
+# name_map identity -> (name_map, index); holding name_map keeps its id() from being reused
+_index_cache = {}
+_index_lock = threading.Lock()
+
+
+def get_name_index(name_map: dict[str, str]) -> ChampionNameIndex:
+    """ Index for `name_map`, built once per map (i.e. once per patch) """
+    cached = _index_cache.get(id(name_map))
+    if cached and cached[0] is name_map:
+        return cached[1]
+    with _index_lock:
+        cached = _index_cache.get(id(name_map))
+        if cached and cached[0] is name_map:
+            return cached[1]
+        index = ChampionNameIndex(name_map)
+        if len(_index_cache) >= 4:  # only ever a patch or two alive at once
+            _index_cache.clear()
+        _index_cache[id(name_map)] = (name_map, index)
+        return index
+
+
 def fuzzy_dd_lookup(raw: str, name_map: dict):
+    return get_name_index(name_map).lookup(raw)
+
+
+def linear_dd_lookup(raw: str, name_map: dict):
+    """ The original linear scan; kept as the reference for benchmarks """
     key = raw.lower().replace(" ", "")
 
     # exact
@@ -59,7 +192,7 @@ def fuzzy_dd_lookup(raw: str, name_map: dict):
             best = name_map[k]
 
     # accept only if reasonably close
-    if best_dist <= 3:
+    if best_dist <= FUZZY_MAX_DIST:
         return best
 
     raise ValueError(f"No DDragon match for '{raw}'")
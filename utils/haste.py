@@ -0,0 +1,209 @@
+"""
+Ability-haste cooldowns for many champions at once.
+
+Every champion's parsed ability rows go into one float array of base cooldowns,
+champion × ability × rank. Scaling it by 100 / (100 + haste) for a whole team,
+or the whole patch, is a single broadcasted multiply. The result is
+champion × ability × rank × haste when several haste values are asked for.
+The HASTE_BREAKPOINTS slice is computed once when the table is built.
+
+    python -m utils.haste Gnar --key R --haste 60
+    python -m utils.haste "Gnar + Vi + Ahri + Jinx + Leona" --key R --haste 100
+    python -m utils.haste Vi --breakpoints
+
+Passives (key "P") are left unscaled: ability haste doesn't apply to almost all of them.
+For ammo abilities without a real cast cooldown (Teemo R), the recharge time is
+scaled, as that's the number the table shows for them.
+"""
+import argparse
+
+import numpy as np
+
+ABILITY_KEYS = ("P", "Q", "W", "E", "R")
+UNAFFECTED_KEYS = ("P",)
+HASTE_BREAKPOINTS = tuple(range(0, 151, 10))  # precomputed; anything else is one extra multiply
+
+
+def haste_multiplier(haste):
+    """ Cooldown factor at `haste` (scalar or array): 100 / (100 + haste) """
+    return 100.0 / (100.0 + np.asarray(haste, dtype=float))
+
+
+def effective_values(row: dict) -> list[float]:
+    """ Per-rank values haste applies to: the recharge for recharge-only ammo abilities, else the cooldown """
+    cd, rec = row["cooldowns"], row["recharge"]
+    if rec and any(x > 0 for x in rec) and max(cd, default=0) <= 2:
+        return rec
+    return cd
+
+
+def apply_haste(abilities: list[dict], haste: float) -> list[dict]:
+    """ Copy of parsed ability rows with cooldowns and recharge at `haste` (passives unchanged) """
+    factor = 100.0 / (100.0 + haste)
+    return [
+        row if row["key"] in UNAFFECTED_KEYS else {
+            **row,
+            "cooldowns": [round(v * factor, 2) for v in row["cooldowns"]],
+            "recharge": [round(v * factor, 2) for v in row["recharge"]],
+        }
+        for row in abilities
+    ]
+
+
+class CooldownTable:
+    """
+    Base cooldowns of a set of champions as one array, plus the same scaled to
+    every HASTE_BREAKPOINTS value.
+
+    base      – (champion, ability, rank); NaN past an ability's last rank,
+                single-value cooldowns repeated across all ranks
+    ranks     – (champion, ability) number of values the source gave (0 = no cooldown)
+    keys      – (champion, ability) ability key, "" for padding
+    names     – (champion, ability) ability name
+    """
+
+    def __init__(self, abilities: dict[str, list[dict]], breakpoints=HASTE_BREAKPOINTS):
+        self.champions = list(abilities)
+        self._index = {champ_id: i for i, champ_id in enumerate(self.champions)}
+        width = max((len(rows) for rows in abilities.values()), default=0)
+        depth = max((len(effective_values(r)) for rows in abilities.values() for r in rows), default=0) or 1
+
+        self.base = np.full((len(self.champions), width, depth), np.nan)
+        self.ranks = np.zeros((len(self.champions), width), dtype=np.int16)
+        self.keys = np.full((len(self.champions), width), "", dtype="<U1")
+        self.names = np.full((len(self.champions), width), "", dtype=object)
+        for c, rows in enumerate(abilities.values()):
+            for a, row in enumerate(rows):
+                values = effective_values(row)
+                if len(values) == 1:
+                    self.base[c, a, :] = values[0]
+                elif values:
+                    self.base[c, a, :len(values)] = values
+                self.ranks[c, a] = len(values)
+                self.keys[c, a] = row["key"]
+                self.names[c, a] = row["name"]
+        self.affected = (self.keys != "") & ~np.isin(self.keys, UNAFFECTED_KEYS)
+
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.by_breakpoint = self.at(self.breakpoints)  # (champion, ability, rank, breakpoint)
+
+    def __len__(self):
+        return len(self.champions)
+
+    def __contains__(self, champ_id):
+        return champ_id in self._index
+
+    def at(self, haste) -> np.ndarray:
+        """
+        Cooldowns at `haste` for every champion, ability and rank in one pass:
+        (champion, ability, rank) for a scalar, (..., len(haste)) for a sequence.
+        """
+        factors = haste_multiplier(np.atleast_1d(haste))                      # (H,)
+        scale = np.where(self.affected[:, :, None, None], factors, 1.0)  # (C, A, 1, H)
+        scaled = self.base[..., None] * scale
+        return scaled[..., 0] if np.ndim(haste) == 0 else scaled
+
+    def cooldowns_at(self, haste: float) -> np.ndarray:
+        """ at(haste), served from the precomputed breakpoints when `haste` is one of them """
+        hit = np.flatnonzero(self.breakpoints == haste)
+        return self.by_breakpoint[..., hit[0]] if hit.size else self.at(haste)
+
+    def _select(self, champions, keys) -> tuple[np.ndarray, np.ndarray]:
+        """ (champion indices, ability mask) for the chosen champions and ability keys """
+        rows = np.array([self._index[c] for c in champions] if champions else range(len(self.champions)), dtype=int)
+        mask = self.keys[rows] != ""
+        if keys:
+            mask &= np.isin(self.keys[rows], list(keys))
+        return rows, mask
+
+    def query(self, champions=None, keys=None, haste: float = 0.0, rank: int | None = None) -> list[dict]:
+        """
+        [{"champion", "key", "name", "cooldowns"}] at `haste` for `champions`
+        (DDragon ids, default all) and ability `keys` (e.g. "R"), in table order.
+        cooldowns holds every rank, or just `rank` (1-based, clamped to the last).
+        """
+        rows, mask = self._select(champions, keys)
+        # (selected champion, ability, rank), scaled and rounded in one pass, then unpacked once
+        values = np.round(self.cooldowns_at(haste)[rows], 2).tolist()
+        counts, keys, names = self.ranks[rows].tolist(), self.keys[rows].tolist(), self.names[rows].tolist()
+        out = []
+        for i, a in zip(*(axis.tolist() for axis in np.nonzero(mask))):
+            ranks = values[i][a][:counts[i][a]]
+            if rank is not None and ranks:
+                ranks = [ranks[min(rank, len(ranks)) - 1]]
+            out.append({"champion": self.champions[rows[i]], "key": keys[i][a], "name": names[i][a], "cooldowns": ranks})
+        return out
+
+    def breakpoint_rows(self, champions=None, keys=None) -> list[dict]:
+        """ [{"champion", "key", "name", "cooldowns"}]: each ability's last-rank cooldown at every breakpoint """
+        rows, mask = self._select(champions, keys)
+        table = self.by_breakpoint[rows]  # (champion, ability, rank, breakpoint)
+        last = np.maximum(self.ranks[rows] - 1, 0)
+        final = np.round(np.take_along_axis(table, last[:, :, None, None], axis=2)[:, :, 0, :], 2).tolist()
+        counts, keys, names = self.ranks[rows].tolist(), self.keys[rows].tolist(), self.names[rows].tolist()
+        return [
+            {"champion": self.champions[rows[i]], "key": keys[i][a], "name": names[i][a],
+             "cooldowns": final[i][a] if counts[i][a] else []}
+            for i, a in zip(*(axis.tolist() for axis in np.nonzero(mask)))
+        ]
+
+
+def load_table(patch: str, champion_ids=()) -> CooldownTable:
+    """
+    Table of every champion in the ability cache for `patch` (all of them after
+    --prefetch), plus `champion_ids` fetched now if they aren't cached
+    """
+    from utils.ability_cache import export_abilities
+    from utils.abilities import get_champion_abilities
+
+    abilities = {champ_id: entry["rows"] for champ_id, entry in export_abilities(patch).items() if entry["rows"]}
+    for champ_id in champion_ids:
+        if champ_id not in abilities:
+            rows, _source = get_champion_abilities(champ_id, patch)
+            if rows:
+                abilities[champ_id] = rows
+    return CooldownTable(abilities)
+
+
+def _fmt(values) -> str:
+    return ", ".join(f"{v:g}" for v in values) if values else "-"
+
+
+def main():
+    from tabulate import tabulate
+    from utils.abilities import fetch_latest_patch
+    from utils.champion_registry import load_champion_registry
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("champions", help="one name or a team, e.g. 'Gnar + Vi + Ahri'")
+    parser.add_argument("--key", nargs="+", choices=ABILITY_KEYS, help="only these abilities (default: all)")
+    parser.add_argument("--haste", type=float, default=0.0, help="ability haste (default 0)")
+    parser.add_argument("--rank", type=int, help="only this rank / level")
+    parser.add_argument("--breakpoints", action="store_true",
+                        help="each ability's last-rank cooldown at every haste breakpoint instead")
+    args = parser.parse_args()
+
+    patch = fetch_latest_patch()
+    registry = load_champion_registry(patch)
+    ids = [registry.resolve(name.strip()).id for name in args.champions.split("+") if name.strip()]
+    table = load_table(patch, ids)
+    ids = [champ_id for champ_id in ids if champ_id in table]
+    if not ids:
+        print("No ability data for any of those champions.")
+        return
+
+    if args.breakpoints:
+        rows = table.breakpoint_rows(ids, args.key)
+        headers = ["Champion", "Key", "Ability", *(f"{b:g}" for b in table.breakpoints)]
+        print(tabulate([[r["champion"], r["key"], r["name"], *(f"{v:g}" for v in r["cooldowns"])] for r in rows if r["cooldowns"]],
+                       headers=headers, tablefmt="simple"))
+        return
+
+    rows = table.query(ids, args.key, args.haste, args.rank)
+    print(f"Patch {patch}, {args.haste:g} ability haste")
+    print(tabulate([[r["champion"], r["key"], r["name"], _fmt(r["cooldowns"])] for r in rows],
+                   headers=["Champion", "Key", "Ability", "Cooldowns"], tablefmt="fancy_grid"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import os
+import threading
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from utils import profiler
+
+if TYPE_CHECKING:
+    import requests
+
+# requests / urllib3 are imported by get_session(), so importing this module
+# (and everything built on it) stays cheap until the first real request
+
+DEFAULT_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+POOL_CONNECTIONS = 16         # hosts kept in the pool manager (ddragon, cdragon, meraki, u.gg, riot)
+POOL_MAXSIZE = 16             # keep-alive sockets per host, enough for the parallel fetches
+
+RETRY = dict(  # urllib3 Retry(...) arguments
+    total=3,
+    connect=2,
+    read=1,
+    status=2,
+    backoff_factor=0.3,  # 0s, 0.6s, 1.2s ...
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,  # hand the last 429/5xx back to the caller instead of raising
+)
+# get(..., retries=False): only a failed connect is retried. A read timeout or a
+# 429/5xx goes straight back to the caller, for lookups that have a fallback of
+# their own (Meraki → CDragon) and for the crawler, which backs off by itself.
+FAST_RETRY = dict(
+    total=1,
+    connect=1,
+    read=0,
+    status=0,
+    status_forcelist=(),
+    allowed_methods=frozenset({"GET", "HEAD"}),
+    raise_on_status=False,
+)
+
+_sessions = {}  # retries (bool) -> requests.Session
+_session_lock = threading.Lock()
+_offline = False
+# see utils/http_replay.py: send every request to a local stand-in server / save every response
+_upstream = os.environ.get("LCH_HTTP_UPSTREAM", "").rstrip("/") or None
+_recording = None
+
+
+class OfflineError(ConnectionError):
+    """ A network request was attempted while offline mode is on """
+
+
+def set_offline(offline: bool = True):
+    """ In offline mode every request fails immediately instead of touching the network """
+    global _offline
+    _offline = offline
+
+
+def is_offline() -> bool:
+    return _offline
+
+
+def set_upstream(base_url: str | None):
+    """ Send every request to `base_url`/<host>/<path> (a utils.http_replay server); None for the real hosts """
+    global _upstream
+    _upstream = base_url.rstrip("/") if base_url else None
+
+
+def set_recording(directory: str | None):
+    """ Save every response into a utils.http_replay recording directory; None to stop """
+    global _recording
+    if directory:
+        from utils.http_replay import Recording
+        _recording = Recording(directory)
+    else:
+        _recording = None
+
+
+def _route(url: str) -> str:
+    if _upstream is None:
+        return url
+    parts = urlsplit(url)
+    return f"{_upstream}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def get_session(retries: bool = True) -> "requests.Session":
+    """
+    Process-wide session: one keep-alive connection pool per host for every fetcher.
+    retries=False is a second session with the FAST_RETRY policy (its own pools).
+    """
+    session = _sessions.get(retries)
+    if session is None:
+        with _session_lock:
+            session = _sessions.get(retries)
+            if session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.request import ACCEPT_ENCODING  # "gzip,deflate" (+ ",br" when brotli is installed)
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=Retry(**(RETRY if retries else FAST_RETRY)),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+                _sessions[retries] = session
+    return session
+
+
+def get(url: str, timeout=DEFAULT_TIMEOUT, retries: bool = True, **kwargs) -> "requests.Response":
+    """
+    requests.get through the shared session, always with a timeout.
+    retries=False skips the hidden read / 429 / 5xx retries (see FAST_RETRY).
+    """
+    if _offline:
+        raise OfflineError(f"offline mode: not fetching {url}")
+    if not profiler.is_enabled():
+        r = get_session(retries).get(_route(url), timeout=timeout, **kwargs)
+    else:
+        with profiler.stage(f"GET {urlsplit(url).netloc}", url=url) as span:
+            r = get_session(retries).get(_route(url), timeout=timeout, **kwargs)
+            span.args["status"] = r.status_code
+            span.args["bytes"] = len(r.content)  # decoded body
+            if r.headers.get("Content-Length", "").isdigit():
+                span.args["wire_bytes"] = int(r.headers["Content-Length"])  # as sent, compressed
+    if _recording is not None and r.status_code != 304:
+        _recording.record(url, r)
+    return r
+
+
+if os.environ.get("LCH_HTTP_RECORD"):
+    set_recording(os.environ["LCH_HTTP_RECORD"])
+
+
+def connection_stats() -> dict[str, int]:
+    """
+    Connections opened vs reused across all host pools, e.g.
+    {"requests": 12, "opened": 3, "reused": 9}
+    """
+    opened = sent = 0
+    for session in list(_sessions.values()):
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened += pool.num_connections
+                sent += pool.num_requests
+    return {"requests": sent, "opened": opened, "reused": max(sent - opened, 0)}
+
+
+def close_session():
+    with _session_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,238 @@
+"""
+Record/replay for every HTTP fetch the tool makes (DDragon, CommunityDragon,
+Meraki, u.gg, the Riot patch schedule), with latency and failure injection.
+
+Record while online: every http_client.get response is saved
+
+    LCH_HTTP_RECORD=./recordings/vi python fuzzy_cooldown_info_helper.py
+
+Replay with no network: a local stand-in server answers from the recording and
+http_client is pointed at it (URLs are rewritten to <upstream>/<host>/<path>)
+
+    python -m utils.http_replay ./recordings/vi --port 8765 \\
+        --rule "merakianalytics:timeout" --rule "*:latency=0.05,bandwidth=500k"
+    LCH_HTTP_UPSTREAM=http://127.0.0.1:8765 python fuzzy_cooldown_info_helper.py
+
+Rules are PATTERN:ACTIONS; PATTERN is a substring of host+path ("*" is every
+request), ACTIONS a comma-separated list of
+    latency=SECONDS     wait before answering
+    bandwidth=N[k|m]    send the body at N bytes/s
+    status=CODE         answer CODE (404, 503, ...) instead of the recording
+    timeout             never answer; the client's read timeout fires
+    p=FRACTION          apply the rule's faults to this fraction of requests only
+Every matching rule applies, in order. URLs missing from the recording are a 404.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+RECORD_ENV = "LCH_HTTP_RECORD"
+UPSTREAM_ENV = "LCH_HTTP_UPSTREAM"
+INDEX_NAME = "index.json"
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+TIMEOUT_HANG = 60.0  # seconds a "timeout" request is held, longer than any client read timeout
+CHUNK_INTERVAL = 0.05  # bandwidth-capped bodies go out in pieces this far apart
+
+
+def request_key(url: str) -> str:
+    """ host + path + query; the scheme doesn't survive the rewrite to the local server """
+    parts = urlsplit(url)
+    return parts.netloc + parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+# --- recordings ---
+class Recording:
+    """
+    A directory of recorded responses: index.json maps request_key -> {"status",
+    "headers", "body"} with each body stored in its own file.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        try:
+            with open(os.path.join(directory, INDEX_NAME), encoding="utf-8") as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def add(self, url: str, status: int, headers: dict, body: bytes):
+        key = request_key(url)
+        name = hashlib.sha1(key.encode()).hexdigest()
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, name), "wb") as f:
+            f.write(body)
+        with self._lock:
+            self.index[key] = {
+                "status": status,
+                "headers": {h: headers[h] for h in KEPT_HEADERS if h in headers},
+                "body": name,
+            }
+            with open(os.path.join(self.directory, INDEX_NAME + ".tmp"), "w", encoding="utf-8") as f:
+                json.dump(self.index, f, indent=1)
+            os.replace(os.path.join(self.directory, INDEX_NAME + ".tmp"), os.path.join(self.directory, INDEX_NAME))
+
+    def record(self, url: str, response):
+        """ Save a requests.Response (body as decoded, without Content-Encoding) """
+        self.add(url, response.status_code, response.headers, response.content)
+
+    def get(self, key: str) -> tuple[int, dict, bytes] | None:
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, entry["body"]), "rb") as f:
+            return entry["status"], entry["headers"], f.read()
+
+
+# --- fault injection ---
+@dataclass
+class Rule:
+    pattern: str                   # substring of request_key, "*" for all
+    latency: float = 0.0           # seconds before the response starts
+    bandwidth: float | None = None  # body bytes per second
+    status: int | None = None      # replace the recorded response with this status
+    timeout: bool = False          # hold the request without answering
+    probability: float = 1.0
+
+    def matches(self, key: str) -> bool:
+        return self.pattern == "*" or self.pattern in key
+
+
+def parse_rule(text: str) -> Rule:
+    """ "merakianalytics:status=503,p=0.5" -> Rule("merakianalytics", status=503, probability=0.5) """
+    pattern, _, actions = text.rpartition(":")
+    if not pattern:
+        raise ValueError(f"rule '{text}' has no PATTERN: part")
+    rule = Rule(pattern)
+    for action in filter(None, (a.strip() for a in actions.split(","))):
+        name, _, value = action.partition("=")
+        if name == "latency":
+            rule.latency = float(value)
+        elif name == "bandwidth":
+            scale = {"k": 1024, "m": 1024 * 1024}.get(value[-1:].lower(), 1)
+            rule.bandwidth = float(value.rstrip("kKmM")) * scale
+        elif name == "status":
+            rule.status = int(value)
+        elif name == "timeout":
+            rule.timeout = True
+        elif name == "p":
+            rule.probability = float(value)
+        else:
+            raise ValueError(f"unknown action '{name}' in rule '{text}'")
+    return rule
+
+
+# --- stand-in server ---
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, recording: Recording, rules=(), address=("127.0.0.1", 0), seed: int | None = None):
+        super().__init__(address, _ReplayHandler)
+        self.recording = recording
+        self.rules = list(rules)
+        self.rng = random.Random(seed)
+        self.stats = {"served": 0, "missing": 0, "injected": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def faults_for(self, key: str) -> list[Rule]:
+        with self._lock:
+            return [r for r in self.rules if r.matches(key) and self.rng.random() < r.probability]
+
+    def count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real hosts
+
+    def do_GET(self):
+        key = self.path.lstrip("/")
+        faults = self.server.faults_for(key)
+        if faults:
+            self.server.count("injected")
+
+        delay = sum(r.latency for r in faults)
+        if any(r.timeout for r in faults):
+            delay = TIMEOUT_HANG
+        if delay:
+            time.sleep(delay)
+
+        status = next((r.status for r in faults if r.status), None)
+        recorded = self.server.recording.get(key) if status is None else None
+        if status is not None:
+            headers, body = {"Content-Type": "text/plain"}, f"injected {status}".encode()
+        elif recorded is None:
+            self.server.count("missing")
+            status, headers, body = 404, {"Content-Type": "text/plain", "X-Replay-Miss": "1"}, b"not recorded"
+        else:
+            self.server.count("served")
+            status, headers, body = recorded
+
+        etag = headers.get("ETag")
+        if status == 200 and etag and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+
+        encoding = None
+        if len(body) > 1024 and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body, encoding = gzip.compress(body, compresslevel=6), "gzip"
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self._send_body(body, min((r.bandwidth for r in faults if r.bandwidth), default=None))
+
+    def _send_body(self, body: bytes, bandwidth: float | None):
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        chunk = max(1, int(bandwidth * CHUNK_INTERVAL))
+        for i in range(0, len(body), chunk):
+            self.wfile.write(body[i:i + chunk])
+            self.wfile.flush()
+            time.sleep(CHUNK_INTERVAL)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", help="directory written with LCH_HTTP_RECORD")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rule", action="append", default=[], metavar="PATTERN:ACTIONS")
+    parser.add_argument("--seed", type=int, default=None, help="makes p= rules reproducible")
+    args = parser.parse_args()
+
+    recording = Recording(args.recording)
+    server = ReplayServer(recording, [parse_rule(r) for r in args.rule], ("127.0.0.1", args.port), args.seed)
+    print(f"Serving {len(recording)} recorded responses on {server.url}")
+    print(f"  {UPSTREAM_ENV}={server.url} python fuzzy_cooldown_info_helper.py")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import threading
+
+# The League client (LCU) serves its REST API on localhost over HTTPS with a
+# self-signed certificate; port and password are in the client's lockfile:
+#   LeagueClient:<pid>:<port>:<password>:https
+LOCKFILE_ENV = "LCU_LOCKFILE"
+LOCKFILE_PATHS = (
+    r"C:\Riot Games\League of Legends\lockfile",
+    "/Applications/League of Legends.app/Contents/LoL/lockfile",
+)
+LCU_TIMEOUT = (0.5, 2)  # it's localhost, anything slower means the client isn't answering
+CHAMP_SELECT_SESSION = "/lol-champ-select/v1/session"
+
+
+def find_lockfile(path: str | None = None) -> str:
+    """ `path`, $LCU_LOCKFILE or the default install location. Raises FileNotFoundError """
+    for candidate in (path, os.environ.get(LOCKFILE_ENV), *LOCKFILE_PATHS):
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    raise FileNotFoundError("League client lockfile not found; is the client running? (or set $LCU_LOCKFILE)")
+
+
+def read_lockfile(path: str) -> tuple[str, str]:
+    """ (base url, password) from a lockfile """
+    with open(path, encoding="utf-8") as f:
+        _name, _pid, port, password, protocol = f.read().strip().split(":")
+    return f"{protocol}://127.0.0.1:{port}", password
+
+
+class LCUClient:
+    """
+    Minimal League client API reader. Uses its own session instead of the shared
+    http_client one: different auth, no certificate check, and offline mode
+    doesn't apply to a server on this machine.
+    """
+
+    def __init__(self, base_url: str, password: str | None = None):
+        self.base_url = base_url.rstrip("/")
+        self.password = password
+        self._session = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_lockfile(cls, path: str | None = None) -> "LCUClient":
+        return cls(*read_lockfile(find_lockfile(path)))
+
+    def _get_session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    import urllib3
+
+                    session = requests.Session()
+                    if self.password is not None:
+                        session.auth = ("riot", self.password)
+                    session.verify = False  # the client's certificate is self-signed
+                    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+                    self._session = session
+        return self._session
+
+    def get_json(self, endpoint: str):
+        """ Parsed JSON of `endpoint`, or None when it 404s or the client isn't reachable """
+        import requests
+
+        try:
+            r = self._get_session().get(self.base_url + endpoint, timeout=LCU_TIMEOUT)
+        except requests.RequestException:
+            return None
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r.json()
+
+    def champ_select_session(self) -> dict | None:
+        """ The current champ select session, None outside of champ select """
+        return self.get_json(CHAMP_SELECT_SESSION)
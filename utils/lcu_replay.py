@@ -0,0 +1,114 @@
+"""
+Local stand-in for the League client's champ-select endpoint, replaying a
+recorded session timeline so --watch can be tried (and timed) without a game.
+
+    python -m utils.lcu_replay [recording.json] [--port 8999] [--speed 1]
+    python fuzzy_cooldown_info_helper.py --watch --lcu http://127.0.0.1:8999
+
+recording.json is what `--watch --record FILE` writes: {"frames": [{"at", "session"}]}.
+Without one, a demo timeline is built from data_examples/champselect.py with
+an enemy lock-in every couple of seconds.
+The clock starts with the first request; after the last frame (+ END_AFTER)
+the endpoint 404s again like the client does once champ select is over.
+"""
+import argparse
+import ast
+import copy
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.lcu import CHAMP_SELECT_SESSION
+
+EXAMPLE_SESSION = os.path.join(os.path.dirname(__file__), "..", "data_examples", "champselect.py")
+END_AFTER = 1.0  # seconds the last frame stays up
+DEMO_PICKS = ((1.0, 254), (3.0, 150), (5.0, 103), (6.5, 222), (8.0, 412))  # Vi, Gnar, Ahri, Jinx, Thresh
+NO_SESSION = {"errorCode": "RPC_ERROR", "httpStatus": 404, "message": "No active delegate"}
+
+
+def load_recording(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return sorted(json.load(f)["frames"], key=lambda frame: frame["at"])
+
+
+def demo_recording(picks=DEMO_PICKS) -> list[dict]:
+    """ Frames of the example session with enemies locking in at the given (seconds, champion id) """
+    with open(EXAMPLE_SESSION, encoding="utf-8") as f:
+        base = ast.literal_eval(f.read())  # a pprint'ed session dict, not runnable code
+    frames = [{"at": 0.0, "session": copy.deepcopy(base)}]
+    their_team = []
+    for cell, (at, champion_id) in enumerate(picks, start=5):
+        their_team.append({
+            "cellId": cell, "championId": champion_id, "championPickIntent": 0,
+            "assignedPosition": "", "team": 2, "summonerId": 0, "puuid": "",
+        })
+        session = copy.deepcopy(base)
+        session["theirTeam"] = copy.deepcopy(their_team)
+        frames.append({"at": at, "session": session})
+    return frames
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, frames: list[dict], address=("127.0.0.1", 0), speed: float = 1.0):
+        super().__init__(address, _ReplayHandler)
+        self.frames = frames
+        self.speed = speed
+        self.started = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def current_session(self) -> dict | None:
+        with self._lock:
+            if self.started is None:
+                self.started = time.monotonic()
+        elapsed = (time.monotonic() - self.started) * self.speed
+        if not self.frames or elapsed > self.frames[-1]["at"] + END_AFTER:
+            return None
+        current = None
+        for frame in self.frames:
+            if frame["at"] > elapsed:
+                break
+            current = frame["session"]
+        return current
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        session = self.server.current_session() if self.path == CHAMP_SELECT_SESSION else None
+        body = json.dumps(session if session is not None else NO_SESSION).encode()
+        self.send_response(200 if session is not None else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", nargs="?", help="JSON written by --watch --record (default: demo timeline)")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    args = parser.parse_args()
+
+    frames = load_recording(args.recording) if args.recording else demo_recording()
+    server = ReplayServer(frames, ("127.0.0.1", args.port), args.speed)
+    print(f"Replaying {len(frames)} frames ({frames[-1]['at']:.1f}s) on {server.url}{CHAMP_SELECT_SESSION}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import os
+import re
+import sys
+import json
+import math
+import zlib
+import struct
+import tempfile
+import threading
+from array import array
+
+MATCHUP_DIR = "./cache/matchups"
+DEFAULT_TIER = "world_emerald_plus"
+
+# every numeric field of a u.gg "counters" entry
+METRICS = (
+    "win_rate", "pick_rate", "matches",
+    "gold_adv_15", "xp_adv_15", "cs_adv_15", "kill_adv_15", "jungle_cs_adv_15",
+    "carry_percentage_15", "team_gold_difference_15",
+    "duo_gold_adv_15", "duo_xp_adv_15", "duo_cs_adv_15", "duo_kill_adv_15", "duo_carry_percentage_15",
+)
+ROLES = ("top", "jungle", "mid", "adc", "support")
+
+_MATCHUP_URL = re.compile(r"/matchups/[^/]+/[^/]+/(\d+)/")
+_FILE_MAGIC = b"LCHM1"
+
+
+def split_tier_role(block_key: str) -> tuple[str, str]:
+    """ "world_emerald_plus_top" -> ("world_emerald_plus", "top") """
+    tier, _, role = block_key.rpartition("_")
+    return tier, role
+
+
+class _Rows:
+    """
+    The row columns and the block index that points into them. compact() builds
+    a new one and publishes it with a single assignment, so a reader that takes
+    `rows = store._rows` once always sees spans that match its columns.
+    add_block() only appends rows past every published span before it adds the block.
+    """
+    __slots__ = ("champion", "opponent", "role", "tier", "values", "blocks")
+
+    def __init__(self):
+        self.champion = array("H")
+        self.opponent = array("H")
+        self.role = array("B")
+        self.tier = array("H")
+        self.values = array("f")  # row-major, len(metrics) per row
+        self.blocks = {}  # (champion, role idx, tier idx) -> (first row, end row)
+
+
+class MatchupStore:
+    """
+    All u.gg counter stats for one patch in flat typed arrays, one row per
+    (champion, opponent, role, rank/region tier) and one float32 column per metric.
+
+    Rows of one (champion, role, tier) block are contiguous and located through
+    a small block index, so slicing a champion/role/tier never scans the store.
+    Missing metrics are NaN.
+    """
+
+    def __init__(self, patch: str, metrics=METRICS):
+        self.patch = patch
+        self.metrics = tuple(metrics)
+        self._metric_pos = {m: i for i, m in enumerate(self.metrics)}
+        self.roles = list(ROLES)
+        self.tiers = []
+        self._role_pos = {r: i for i, r in enumerate(self.roles)}
+        self._tier_pos = {}
+
+        self._rows = _Rows()
+        self._lock = threading.RLock()  # writers only; readers work off one _rows snapshot
+        self.dirty = False
+
+    # --- dimensions ---
+    def _role_index(self, role: str) -> int:
+        if role not in self._role_pos:
+            self._role_pos[role] = len(self.roles)
+            self.roles.append(role)
+        return self._role_pos[role]
+
+    def _tier_index(self, tier: str) -> int:
+        if tier not in self._tier_pos:
+            self._tier_pos[tier] = len(self.tiers)
+            self.tiers.append(tier)
+        return self._tier_pos[tier]
+
+    def __len__(self):
+        return len(self._rows.champion)
+
+    @property
+    def nbytes(self) -> int:
+        rows = self._rows
+        return sum(a.itemsize * len(a) for a in (rows.champion, rows.opponent, rows.role, rows.tier, rows.values))
+
+    def _span(self, rows: _Rows, champion_key: int, role: str, tier: str):
+        return rows.blocks.get((champion_key, self._role_pos.get(role.lower()), self._tier_pos.get(tier)))
+
+    # --- writing ---
+    def add_block(self, champion_key: int, role: str, tier: str, counters: list[dict]):
+        """ Store (or replace) one champion's counters list for a role and tier """
+        nan = math.nan
+        with self._lock:
+            rows = self._rows
+            r, t = self._role_index(role.lower()), self._tier_index(tier)
+            start = len(rows.champion)
+            for c in counters:
+                if "champion_id" not in c:
+                    continue
+                rows.champion.append(champion_key)
+                rows.opponent.append(int(c["champion_id"]))
+                rows.role.append(r)
+                rows.tier.append(t)
+                rows.values.extend(float(c[m]) if c.get(m) is not None else nan for m in self.metrics)
+            # a replaced block's old rows stay behind until compact()
+            rows.blocks[(champion_key, r, t)] = (start, len(rows.champion))
+            self.dirty = True
+
+    def ingest_ssr(self, ssr) -> int:
+        """ Add every matchup block of a u.gg counter page's SSR data. Returns the number of blocks """
+        added = 0
+        for url in ssr:
+            m = _MATCHUP_URL.search(url)
+            if not m:
+                continue
+            champion_key = int(m.group(1))
+            for block_key, value in (ssr[url].get("data") or {}).items():
+                if not isinstance(value, dict) or "counters" not in value:
+                    continue
+                tier, role = split_tier_role(block_key)
+                self.add_block(champion_key, role, tier, value["counters"])
+                added += 1
+        return added
+
+    def compact(self):
+        """ Drop rows of replaced blocks """
+        with self._lock:
+            old = self._rows
+            live = sorted(old.blocks.items(), key=lambda kv: kv[1][0])
+            if sum(end - start for _, (start, end) in live) == len(old.champion):
+                return
+            width = len(self.metrics)
+            new = _Rows()
+            for block, (start, end) in live:
+                new_start = len(new.champion)
+                for name in ("champion", "opponent", "role", "tier"):
+                    getattr(new, name).extend(getattr(old, name)[start:end])
+                new.values.extend(old.values[start * width:end * width])
+                new.blocks[block] = (new_start, len(new.champion))
+            self._rows = new
+
+    # --- reading ---
+    def has_block(self, champion_key: int, role: str, tier: str = DEFAULT_TIER) -> bool:
+        return self._span(self._rows, champion_key, role, tier) is not None
+
+    def _metrics(self, rows: _Rows, i: int, metrics, out: dict) -> dict:
+        base = i * len(self.metrics)
+        for m in metrics:
+            v = rows.values[base + self._metric_pos[m]]
+            if not math.isnan(v):
+                out[m] = v
+        return out
+
+    def _row(self, rows: _Rows, i: int, metrics) -> dict:
+        return self._metrics(rows, i, metrics, {
+            "champion_id": rows.champion[i],
+            "opponent_id": rows.opponent[i],
+            "role": self.roles[rows.role[i]],
+            "tier": self.tiers[rows.tier[i]],
+        })
+
+    def counters(self, champion_key: int, role: str, tier: str = DEFAULT_TIER, metrics=None) -> list[dict]:
+        """ One block in u.gg's counters shape (champion_id is the opponent). [] if it isn't stored """
+        rows = self._rows
+        span = self._span(rows, champion_key, role, tier)
+        if not span:
+            return []
+        return [self._metrics(rows, i, metrics or self.metrics, {"champion_id": rows.opponent[i]}) for i in range(*span)]
+
+    def get(self, champion_key: int, opponent_key: int, role: str, tier: str = DEFAULT_TIER,
+            metric: str = "win_rate") -> float | None:
+        rows = self._rows
+        span = self._span(rows, champion_key, role, tier)
+        if not span:
+            return None
+        col = self._metric_pos[metric]
+        for i in range(*span):
+            if rows.opponent[i] == opponent_key:
+                v = rows.values[i * len(self.metrics) + col]
+                return None if math.isnan(v) else v
+        return None
+
+    def select(self, champion=None, opponent=None, role=None, tier=None, metrics=None):
+        """ Yield rows of any slice; None means "all" for that dimension """
+        r = self._role_pos.get(role.lower()) if role is not None else None
+        t = self._tier_pos.get(tier) if tier is not None else None
+        if (role is not None and r is None) or (tier is not None and t is None):
+            return
+        rows = self._rows
+        for (c, br, bt), (start, end) in list(rows.blocks.items()):
+            if champion is not None and c != champion:
+                continue
+            if r is not None and br != r:
+                continue
+            if t is not None and bt != t:
+                continue
+            for i in range(start, end):
+                if opponent is None or rows.opponent[i] == opponent:
+                    yield self._row(rows, i, metrics or self.metrics)
+
+    # --- persistence ---
+    def to_bytes(self) -> bytes:
+        with self._lock:
+            self.compact()
+            rows = self._rows
+            header = json.dumps({
+                "patch": self.patch,
+                "metrics": self.metrics,
+                "roles": self.roles,
+                "tiers": self.tiers,
+                "blocks": [[c, r, t, start, end] for (c, r, t), (start, end) in rows.blocks.items()],
+                "rows": len(rows.champion),
+                "byteorder": sys.byteorder,
+            }).encode()
+            body = b"".join(a.tobytes() for a in (rows.champion, rows.opponent, rows.role, rows.tier, rows.values))
+        return _FILE_MAGIC + zlib.compress(struct.pack("<I", len(header)) + header + body, 6)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "MatchupStore":
+        if not blob.startswith(_FILE_MAGIC):
+            raise ValueError("not a matchup store file")
+        raw = zlib.decompress(blob[len(_FILE_MAGIC):])
+        (header_len,) = struct.unpack_from("<I", raw)
+        header = json.loads(raw[4:4 + header_len])
+        store = cls(header["patch"], header["metrics"])
+        store.roles = header["roles"]
+        store.tiers = header["tiers"]
+        store._role_pos = {r: i for i, r in enumerate(store.roles)}
+        store._tier_pos = {t: i for i, t in enumerate(store.tiers)}
+
+        n = header["rows"]
+        offset = 4 + header_len
+        for name in ("champion", "opponent", "role", "tier", "values"):
+            col = getattr(store._rows, name)
+            count = n * len(store.metrics) if name == "values" else n
+            col.frombytes(raw[offset:offset + count * col.itemsize])
+            offset += count * col.itemsize
+            if header["byteorder"] != sys.byteorder:
+                col.byteswap()
+        store._rows.blocks = {(c, r, t): (start, end) for c, r, t, start, end in header["blocks"]}
+        return store
+
+    def save(self, directory: str = MATCHUP_DIR):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.patch}.bin")
+        with self._lock:  # one writer at a time, so an older snapshot can't replace a newer one
+            blob = self.to_bytes()
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=f"{self.patch}.", suffix=".tmp")  # unique across processes too
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(blob)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            self.dirty = False
+
+
+_stores = {}  # patch -> MatchupStore
+_stores_lock = threading.Lock()
+
+
+def register_matchup_store(store: MatchupStore):
+    """ Make `store` the answer for its patch for the rest of the process """
+    with _stores_lock:
+        _stores[store.patch] = store
+
+
+def load_matchup_store(patch: str, directory: str = MATCHUP_DIR) -> MatchupStore:
+    """ The patch's store, read from disk once per process (empty if nothing was saved yet) """
+    store = _stores.get(patch)
+    if store is not None:
+        return store
+    with _stores_lock:
+        store = _stores.get(patch)
+        if store is None:
+            try:
+                with open(os.path.join(directory, f"{patch}.bin"), "rb") as f:
+                    store = MatchupStore.from_bytes(f.read())
+            except (OSError, ValueError, zlib.error):
+                store = MatchupStore(patch)
+            _stores[patch] = store
+    return store
+
+
+def save_matchup_stores(directory: str = MATCHUP_DIR):
+    """ Write every loaded store that changed since its last save """
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        if store.dirty:
+            store.save(directory)
@@ -0,0 +1,145 @@
+import os
+import json
+import gzip
+import time
+import hashlib
+import threading
+
+from utils import http_client, profiler
+
+PAGE_CACHE_DIR = "./cache/pages"
+PAGE_INDEX_PATH = os.path.join(PAGE_CACHE_DIR, "index.json")
+PAGE_FRESH_FOR = 60 * 60                 # serve without asking for 1 hour, then revalidate
+PAGE_CACHE_MAX_BYTES = 100 * 1024 * 1024  # compressed bytes on disk (a u.gg page is ~0.2 MB gzipped)
+
+_lock = threading.Lock()
+_index = None  # url -> {"file", "etag", "last_modified", "fetched_at", "last_access", "size"}
+_stats = {"hits": 0, "misses": 0, "revalidated": 0, "evicted": 0}
+
+
+def _load_index() -> dict:
+    global _index
+    if _index is None:
+        try:
+            with open(PAGE_INDEX_PATH, encoding="utf-8") as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save_index():
+    os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+    with open(PAGE_INDEX_PATH + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(_index, f)
+    os.replace(PAGE_INDEX_PATH + ".tmp", PAGE_INDEX_PATH)
+
+
+def _read_body(entry: dict) -> str | None:
+    try:
+        with open(os.path.join(PAGE_CACHE_DIR, entry["file"]), "rb") as f:
+            return gzip.decompress(f.read()).decode("utf-8")
+    except (OSError, EOFError, gzip.BadGzipFile):
+        return None
+
+
+def _evict(index: dict):
+    """ Drop least recently used pages until the cache fits PAGE_CACHE_MAX_BYTES """
+    total = sum(e["size"] for e in index.values())
+    for url in sorted(index, key=lambda u: index[u]["last_access"]):
+        if total <= PAGE_CACHE_MAX_BYTES:
+            break
+        entry = index.pop(url)
+        total -= entry["size"]
+        _stats["evicted"] += 1
+        try:
+            os.remove(os.path.join(PAGE_CACHE_DIR, entry["file"]))
+        except OSError:
+            pass
+
+
+def _store(url: str, text: str, response) -> None:
+    blob = gzip.compress(text.encode("utf-8"), compresslevel=6)
+    name = hashlib.sha1(url.encode()).hexdigest() + ".html.gz"
+    os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+    with open(os.path.join(PAGE_CACHE_DIR, name + ".tmp"), "wb") as f:
+        f.write(blob)
+    os.replace(os.path.join(PAGE_CACHE_DIR, name + ".tmp"), os.path.join(PAGE_CACHE_DIR, name))
+
+    now = time.time()
+    with _lock:
+        index = _load_index()
+        index[url] = {
+            "file": name,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": now,
+            "last_access": now,
+            "size": len(blob),
+        }
+        _evict(index)
+        _save_index()
+
+
+def fetch_page(url: str, headers: dict | None = None, fresh_for: float = PAGE_FRESH_FOR, retries: bool = True) -> str:
+    """
+    GET `url` through the compressed page cache.
+    Fresh entries are served as is; stale ones are revalidated with a conditional
+    GET (If-None-Match / If-Modified-Since) so an unchanged page costs a 304.
+    Raises requests.HTTPError like r.raise_for_status().
+    retries – False to get 429/5xx and timeouts back at once (see http_client.get)
+    """
+    with _lock:
+        entry = dict(_load_index().get(url) or {})
+
+    body = _read_body(entry) if entry else None
+    if body is not None and time.time() - entry["fetched_at"] < fresh_for:
+        profiler.cache_event("pages", "hit")
+        with _lock:
+            _stats["hits"] += 1
+            if url in _index:
+                _index[url]["last_access"] = time.time()  # persisted with the next write
+        return body
+
+    request_headers = dict(headers or {})
+    if body is not None:
+        if entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    r = http_client.get(url, headers=request_headers, retries=retries)
+    if r.status_code == 304 and body is not None:
+        profiler.cache_event("pages", "revalidated")
+        with _lock:
+            _stats["revalidated"] += 1
+            if url in _index:
+                _index[url]["fetched_at"] = _index[url]["last_access"] = time.time()
+                _save_index()
+        return body
+
+    r.raise_for_status()
+    profiler.cache_event("pages", "miss")
+    with _lock:
+        _stats["misses"] += 1
+    _store(url, r.text, r)
+    return r.text
+
+
+def page_cache_stats() -> dict:
+    """ {"hits", "misses", "revalidated", "evicted", "pages", "bytes"} """
+    with _lock:
+        index = _load_index()
+        return {**_stats, "pages": len(index), "bytes": sum(e["size"] for e in index.values())}
+
+
+def clear_page_cache():
+    global _index
+    with _lock:
+        for entry in _load_index().values():
+            try:
+                os.remove(os.path.join(PAGE_CACHE_DIR, entry["file"]))
+            except OSError:
+                pass
+        _index = {}
+        _save_index()
@@ -1,6 +1,17 @@
+import re
 import json
+import threading
+from collections.abc import Mapping
 
 from utils.fetch_ugg import fetch_champ_counter_ugg
+from utils.patch import get_effective_patch
+from utils.champion_registry import load_champion_registry
+from utils.matchup_store import load_matchup_store, DEFAULT_TIER
+from utils import profiler
+
+
+_decoder = json.JSONDecoder()
+SCRIPT_END = "</script"
 
 
 def extract_json_from_html(html: str, key: str) -> dict:
@@ -14,6 +25,24 @@ def extract_json_from_html(html: str, key: str) -> dict:
     if start == -1:
         raise RuntimeError(f"No opening brace after {key}")
 
+    # the C decoder finds the end of the object itself; no need to balance braces first
+    try:
+        obj, _ = _decoder.raw_decode(html, start)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"No valid JSON object after {key}: {e}") from e
+    return obj
+
+
+def scan_json_from_html(html: str, key: str) -> dict:
+    """ The original character-by-character brace scan; kept as the reference for benchmarks """
+    start = html.find(key)
+    if start == -1:
+        raise RuntimeError(f"{key} not found")
+
+    start = html.find("{", start)
+    if start == -1:
+        raise RuntimeError(f"No opening brace after {key}")
+
     brace_count = 0
     in_str = False
     escape = False
@@ -34,11 +63,151 @@ def extract_json_from_html(html: str, key: str) -> dict:
     raise RuntimeError(f"No closing brace found for {key}")
 
 
-def get_ssr_subdata(ssr: dict, suffix: str):
+# Start of an SSR block value: a {"data": ..., "loading": ..., "error": ..., "idle": ...}
+# request-state object. Rare enough in the payload that each hit can be checked by hand.
+_SSR_BLOCK_VALUE = re.compile(r'\{\s*"(?:data|loading|error|idle)"')
+
+
+def _key_before(text: str, value_start: int, lower: int):
+    """ (key, separator offset) for `"key": <value at value_start>` preceded by "{" or ",", else None """
+    i = value_start - 1
+    while i > lower and text[i].isspace():
+        i -= 1
+    if text[i] != ":":
+        return None
+    i -= 1
+    while i > lower and text[i].isspace():
+        i -= 1
+    if text[i] != '"':
+        return None
+    close = i
+    i = text.rfind('"', lower, close)
+    while i > lower and text[i - 1] == "\\":  # escaped quote inside the key
+        i = text.rfind('"', lower, i)
+    if i <= lower:
+        return None
+    key = json.loads(text[i:close + 1])
+    i -= 1
+    while i > lower and text[i].isspace():
+        i -= 1
+    if text[i] not in "{,":
+        return None
+    return key, i
+
+
+class LazySSRDocument(Mapping):
+    """
+    Read-only dict view of a window.__SSR_DATA__ payload that decodes a block
+    only when it is first accessed, and then keeps it.
+
+    Construction only locates the top-level keys with one regex pass over the
+    payload's <script>. A decoded block is checked to end exactly where the next
+    indexed key starts, or for the last one, at the payload's closing brace
+    (whatever follows it in the script, e.g. window.__APOLLO_STATE__, is never
+    scanned for). If a key was mis-indexed the whole payload is decoded once
+    and its keys are used from then on, iteration included.
+    """
+
+    def __init__(self, html: str, key: str = "window.__SSR_DATA__"):
+        start = html.find(key)
+        if start == -1:
+            raise RuntimeError(f"{key} not found")
+        start = html.find("{", start)
+        if start == -1:
+            raise RuntimeError(f"No opening brace after {key}")
+        script_end = html.find(SCRIPT_END, start)
+        scan_end = script_end if script_end != -1 else len(html)
+
+        self._text = html
+        self._start = start
+        self._spans = {}  # key -> (separator offset, value offset)
+        for m in _SSR_BLOCK_VALUE.finditer(html, start + 1, scan_end):
+            found = _key_before(html, m.start(), start)
+            if found:
+                self._spans.setdefault(found[0], (found[1], m.start()))
+        separators = sorted(sep for sep, _ in self._spans.values())
+        # separator -> the next key's separator; None for the last key, which must end at the closing brace
+        self._next = dict(zip(separators, separators[1:] + [None]))
+        self._decoded = {}
+        self._full = None
+        self._lock = threading.Lock()
+        if not self._index_is_flat(separators, scan_end):
+            self._full = _decoder.raw_decode(html, start)[0]
+
+    def _index_is_flat(self, separators: list[int], scan_end: int) -> bool:
+        """
+        Whether every indexed key sits directly in the payload object, checked
+        before any key is handed out: the first follows the opening brace, the
+        rest a comma, and the text from each value to the next key has balanced
+        braces (the last one closes the payload too). The first nested key
+        would leave its predecessor's value open. Braces inside strings can
+        only cause a needless full decode.
+        """
+        text = self._text
+        if not separators:
+            return True
+        if separators[0] != self._start or any(text[sep] != "," for sep in separators[1:]):
+            return False
+        value_starts = sorted(value for _, value in self._spans.values())
+        for value_start, end in zip(value_starts, separators[1:] + [scan_end]):
+            extra = 1 if end == scan_end else 0  # the payload's closing brace
+            if text.count("}", value_start, end) - text.count("{", value_start, end) != extra:
+                return False
+        return True
+
+    def __getitem__(self, url):
+        if self._full is not None:
+            return self._full[url]
+        if url in self._decoded:
+            return self._decoded[url]
+        if url not in self._spans:
+            raise KeyError(url)
+
+        with self._lock:
+            if url not in self._decoded and self._full is None:
+                sep, value_start = self._spans[url]
+                value, value_end = _decoder.raw_decode(self._text, value_start)
+                if not self._ends_block(value_end, self._next[sep]):
+                    # a nested object looked like a top-level key: fall back to a full decode
+                    self._full = _decoder.raw_decode(self._text, self._start)[0]
+                    return self._full[url]
+                self._decoded[url] = value
+        return self._full[url] if self._full is not None else self._decoded[url]
+
+    def _ends_block(self, value_end: int, next_sep: int | None) -> bool:
+        """ Whether a value decoded up to `value_end` is followed only by whitespace up to the next key's separator """
+        if next_sep is None:  # last key: next comes the payload's own closing brace
+            return self._text[value_end:].lstrip().startswith("}")
+        return value_end <= next_sep and not self._text[value_end:next_sep].strip()
+
+    def __iter__(self):
+        yielded = set()
+        for url in list(self._spans):
+            if self._full is not None:
+                break
+            yielded.add(url)
+            yield url
+        if self._full is not None:
+            # a full decode replaced the index (here or mid-iteration): its keys are the real ones
+            yield from (url for url in self._full if url not in yielded)
+
+    def __len__(self):
+        return len(self._full if self._full is not None else self._spans)
+
+    def __contains__(self, url):
+        return url in (self._full if self._full is not None else self._spans)
+
+
+def load_ssr(html: str, key: str = "window.__SSR_DATA__") -> LazySSRDocument:
+    return LazySSRDocument(html, key)
+
+
+def get_ssr_subdata(ssr: Mapping, suffix: str):
     """ Get first SSR block whose URL ends with given suffix """
-    for url, block in ssr.items():
+    # match on the keys first so a LazySSRDocument only decodes the block it returns
+    for url in ssr:
         if suffix in url:
-            return block.get("data", {})
+            return ssr[url].get("data", {})
     raise KeyError(f"'{suffix}' not found in SSR data")
 
 
@@ -66,16 +235,11 @@ def get_champion_matchup_info(champion_specific_ssr: dict, role: str):
     }
     """
 
-    champ_id_to_name = {}
-    for url, block in champion_specific_ssr.items():
-        if "champion_id" in url:
-            for cid, info in block["data"].items():
-                champ_id_to_name[int(cid)] = info["name"]
-
     matchup_block = None
-    for url, block in champion_specific_ssr.items():
+    for url in champion_specific_ssr:
         if "matchups" not in url:
             continue
+        block = champion_specific_ssr[url]
         for key, value in block.get("data", {}).items():
             if key == get_rank_and_role_name(role):
                 return value["counters"]
@@ -83,21 +247,34 @@ def get_champion_matchup_info(champion_specific_ssr: dict, role: str):
         raise RuntimeError("Lane matchup block not found")
 
 
-def get_rank_and_role_name(role):
-    return f"world_emerald_plus_{role.lower()}"
+def get_rank_and_role_name(role, tier=DEFAULT_TIER):
+    return f"{tier}_{role.lower()}"
 
 
 def parse_ugg_matchups(champion: str, role: str) -> dict[str, dict]:
-    html = fetch_champ_counter_ugg(champion["slug"], role)
-    ssr = extract_json_from_html(html, "window.__SSR_DATA__")
-    champ_data = get_ssr_subdata(ssr, "en_US/champion.json")
-
-    champ_id_to_name = {int(info["key"]): info["name"] for info in champ_data.values()}
+    """
+    Served from the patch's matchup store when the block is there; otherwise the
+    counter page is fetched and all of its rank/region blocks are stored (in
+    memory; save_matchup_stores() writes them out).
+    """
+    patch = get_effective_patch()
+    registry = load_champion_registry(patch)
+    store = load_matchup_store(patch)
 
-    matchups = get_champion_matchup_info(ssr, role)
+    champ = registry.by_slug(champion["slug"])
+    if champ and store.has_block(champ.key, role):
+        profiler.cache_event("matchups", "hit")
+        matchups = store.counters(champ.key, role)
+    else:
+        profiler.cache_event("matchups", "miss")
+        html = fetch_champ_counter_ugg(champion["slug"], role)
+        with profiler.stage("parse u.gg page", champion=champion["slug"], role=role):
+            ssr = load_ssr(html)
+            matchups = get_champion_matchup_info(ssr, role)
+            store.ingest_ssr(ssr)  # written by the caller's save_matchup_stores(), once per batch
 
     return {
-        champ_id_to_name.get(c["champion_id"], f"#{c['champion_id']}"): {
+        registry.name_of(c["champion_id"]): {
             "wr": round(100 - c.get("win_rate", 0), 2),
             "gd15": round(-c.get("gold_adv_15", 0), 2),
             "pickrate": round(c.get("pick_rate", 0), 2),
@@ -1,11 +1,16 @@
 import os
 import re
 import json
+import math
+import time
+import threading
 from datetime import datetime, timedelta
-import requests
-from bs4 import BeautifulSoup
+
+from utils import http_client, profiler
 
 PATCH_META_URL = "https://ddragon.leagueoflegends.com/api/versions.json"
+PATCH_CACHE_PATH = "./cache/patch_info.json"
+PATCH_CACHE_TTL = 60 * 60 * 6  # 6 hours; patches drop every two weeks
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -20,11 +25,114 @@ HEADERS = {
     "Upgrade-Insecure-Requests": "1",
 }
 
+# --- memoized patch metadata ---
+# name -> (value, resolved_at); filled from ./cache/patch_info.json or the network
+_memo = {}
+_memo_locks = {"versions": threading.Lock(), "release_dates": threading.Lock()}
+_disk_lock = threading.Lock()
+
+
+def _read_disk_cache() -> dict:
+    try:
+        with open(PATCH_CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_disk_cache(name: str, value, resolved_at: float):
+    with _disk_lock:
+        data = _read_disk_cache()
+        data[name] = {"value": value, "resolved_at": resolved_at}
+        os.makedirs(os.path.dirname(PATCH_CACHE_PATH), exist_ok=True)
+        with open(PATCH_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+
+def _resolve(name: str, loader):
+    """
+    Return `loader()`'s value, computed at most once per PATCH_CACHE_TTL across
+    processes (via the disk cache) and within this process (via _memo).
+    Concurrent callers wait for the one in-flight resolution instead of starting their own.
+    Exceptions from loader are not cached.
+    """
+    hit = _memo.get(name)
+    if hit and time.time() - hit[1] < PATCH_CACHE_TTL:
+        profiler.cache_event(f"patch {name}", "hit")
+        return hit[0]
+
+    with _memo_locks[name]:
+        # someone else may have resolved it while we waited
+        hit = _memo.get(name)
+        if hit and time.time() - hit[1] < PATCH_CACHE_TTL:
+            profiler.cache_event(f"patch {name}", "hit")
+            return hit[0]
+
+        entry = _read_disk_cache().get(name)
+        if entry and time.time() - entry["resolved_at"] < PATCH_CACHE_TTL:
+            profiler.cache_event(f"patch {name}", "disk")
+            hit = (entry["value"], entry["resolved_at"])
+        else:
+            profiler.cache_event(f"patch {name}", "miss")
+            value = loader()
+            hit = (value, time.time())
+            if value:  # don't pin a failed scrape on disk for the whole TTL
+                _write_disk_cache(name, value, hit[1])
+        _memo[name] = hit
+    return hit[0]
+
+
+def invalidate_patch_cache():
+    """ Forget memoized and on-disk patch metadata so the next call re-resolves it """
+    with _disk_lock:
+        _memo.clear()
+        try:
+            os.remove(PATCH_CACHE_PATH)
+        except OSError:
+            pass
+
+
+def pin_patch_metadata(versions: list[str], release_dates: dict[str, str]):
+    """ Use the given metadata for the rest of the process (offline snapshots); it never expires """
+    _memo["versions"] = (versions, math.inf)
+    _memo["release_dates"] = (release_dates, math.inf)
+
+
+def _fetch_versions() -> list[str]:
+    response = http_client.get(PATCH_META_URL, headers=HEADERS)
+    response.raise_for_status()
+    return response.json()
+
+
+def refresh_versions() -> list[str]:
+    """
+    Re-fetch versions.json now, ignoring the TTL. When a new patch has appeared,
+    everything resolved for the old one (release dates) is forgotten as well.
+    """
+    versions = _fetch_versions()
+    hit = _memo.get("versions")
+    if hit and hit[0][:1] != versions[:1]:
+        invalidate_patch_cache()
+    with _memo_locks["versions"]:
+        _memo["versions"] = (versions, time.time())
+        _write_disk_cache("versions", versions, _memo["versions"][1])
+    return versions
+
+
+def get_versions() -> list[str]:
+    """ Raw Data Dragon versions.json, newest first (memoized) """
+    return _resolve("versions", _fetch_versions)
+
+
+def get_release_dates() -> dict[str, str]:
+    """ get_patch_release_dates(), memoized """
+    return _resolve("release_dates", get_patch_release_dates)
+
+
 def get_latest_patches(count=2) -> list[str]:
     """Get the latest patches from Data Dragon API."""
     try:
-        response = requests.get(PATCH_META_URL, headers=HEADERS, timeout=10)
-        all_patches = response.json()
+        all_patches = get_versions()
 
         # Filter to only include standard patch formats (X.Y)
         standard_patches = []
@@ -77,9 +185,11 @@ def get_patch_release_dates() -> dict[str, str]:
 
     try:
         url = "https://support-leagueoflegends.riotgames.com/hc/en-us/articles/360018987893-Patch-Schedule-League-of-Legends"
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = http_client.get(url, headers=HEADERS)
 
         if response.status_code == 200:
+            from bs4 import BeautifulSoup  # only this scraper needs it; keeps startup light
+
             soup = BeautifulSoup(response.text, 'html.parser')
 
             # Find the patch schedule table
@@ -142,7 +252,7 @@ def estimate_release_dates(patches: list[str]) -> dict[str, dict]:
     result = {}
 
     # Try to get actual release dates first
-    actual_dates = get_patch_release_dates()
+    actual_dates = get_release_dates()
 
     # League patches typically come out on Wednesdays
     current_date = datetime.now()
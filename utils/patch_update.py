@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import hashlib
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils import http_client
+from utils.abilities import get_champion_abilities, parse_meraki, MERAKI_SOURCE
+from utils.ability_cache import export_abilities, put_many_cached_abilities
+from utils.dd_champ_names import load_ddragon_champion_map
+from utils.patch import get_versions, estimate_release_dates
+from utils.prefetch import MERAKI_ALL_URL, PREFETCH_WORKERS
+
+# per-champion hash + cooldown rows of the last update: what the next one compares against,
+# kept apart from the ability cache, which drops a patch as soon as the next one is used.
+# It stays provisional ("final": false) while Meraki's file predates the patch.
+BASELINE_PATH = "./cache/patch_baseline.json"
+DIFF_DIR = "./cache"
+
+# the parts of a parsed ability row that the cooldown table shows
+HASHED_ROW_FIELDS = ("key", "name", "cooldowns", "recharge")
+
+
+def champion_hash(rows: list[dict]) -> str:
+    """ Content hash of one champion's parsed ability rows (parse_meraki / parse_cdragon output) """
+    data = [{f: row.get(f) for f in HASHED_ROW_FIELDS} for row in rows]
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def _read_baseline() -> dict:
+    """
+    {"patch", "from", "final", "meraki": {"etag", "last_modified"},
+     "champions": {DDragon id: {"hash", "rows", "source"}}} of the last update, {} if none
+    """
+    try:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_baseline(baseline: dict):
+    os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+    with open(BASELINE_PATH + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False)
+    os.replace(BASELINE_PATH + ".tmp", BASELINE_PATH)
+
+
+def _meraki_rows(stats: dict, validators: dict) -> tuple[dict[str, list[dict]] | None, dict]:
+    """
+    ({DDragon id or Meraki key: parse_meraki rows} for every champion in Meraki's
+    all-champion file, its {"etag", "last_modified"}). A conditional GET with the
+    stored `validators`: (None, validators) when the file hasn't changed since.
+    """
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    r = http_client.get(MERAKI_ALL_URL, timeout=(3.05, 60), headers=headers)  # several MB unless 304
+    if r.status_code == 304:
+        return None, validators
+    r.raise_for_status()
+    stats["bytes"] += len(r.content)
+    rows = {}
+    for key, champ in r.json().items():
+        rows[key] = parse_meraki(champ)
+        if isinstance(champ, dict) and champ.get("key"):
+            rows.setdefault(champ["key"], rows[key])
+    return rows, {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+
+
+def meraki_covers_patch(validators: dict, patch: str) -> bool:
+    """
+    Whether Meraki's file was modified on or after `patch`'s release day. Meraki
+    only serves "latest" and updates days after a patch; until then its numbers
+    are the previous patch's. An unknown date counts as not yet.
+    """
+    try:
+        modified = parsedate_to_datetime(validators["last_modified"]).astimezone(timezone.utc).date()
+        released = datetime.strptime(estimate_release_dates([patch])[patch]["release_date"], "%Y-%m-%d").date()
+    except (KeyError, TypeError, ValueError):
+        return False
+    return modified >= released
+
+
+def cooldown_diff(old_rows: list[dict], new_rows: list[dict]) -> list[dict]:
+    """ [{"key", "name", "field", "old", "new"}] for every ability whose cooldowns or recharge changed """
+    old_by_key = {(r["key"], r["name"]): r for r in old_rows}
+    changes = []
+    for row in new_rows:
+        old = old_by_key.get((row["key"], row["name"]))
+        for field in ("cooldowns", "recharge"):
+            before = old[field] if old else None
+            if before != row[field]:
+                changes.append({"key": row["key"], "name": row["name"], "field": field, "old": before, "new": row[field]})
+    return changes
+
+
+def update_patch(patch: str, previous: str | None = None, workers: int = PREFETCH_WORKERS, progress=print) -> dict:
+    """
+    Move the ability cache from the previous patch to `patch` and report which
+    champions' cooldowns changed.
+
+    Meraki's all-champion file (one download of several MB, like --prefetch;
+    a 304 when it hasn't changed since the last run) is parsed into the same
+    rows a lookup would show, and each champion's rows are hashed
+    (champion_hash) and compared with the baseline stored by the previous
+    update. The first time there is none, so the previous patch's ability cache
+    stands in for it. Unchanged champions keep their rows; changed ones take
+    the new Meraki rows, and champions Meraki doesn't have go through the usual
+    Meraki → CDragon lookup every time. The cooldown changes are returned and
+    written to cache/patch_diff_<old>_<new>.json.
+
+    Meraki usually lags a patch by a few days. Until its file is newer than the
+    patch's release, the result is provisional: it's stored, but the next run
+    checks again (cheaply, with the 304) and adds what changed since to the diff.
+
+    previous – patch to compare against (default: the one of the last update, else
+               the one before `patch` in versions.json)
+    Returns stats: champions, unchanged, refetched, failed, diff, final, bytes, seconds
+    """
+    say = progress or (lambda _msg: None)
+    start = time.perf_counter()
+    stats = {"champions": 0, "unchanged": 0, "refetched": [], "failed": [], "diff": {}, "final": False,
+             "bytes": 0, "seconds": 0.0}
+
+    stored = _read_baseline()
+    recheck = previous is None and stored.get("patch") == patch
+    if recheck and stored.get("final", True):
+        say(f"Patch {patch} is already up to date.")
+        stats["champions"] = stats["unchanged"] = len(stored["champions"])
+        stats["final"] = True
+        return stats
+    if recheck:  # provisional: compare Meraki's file against what the last run stored for this patch
+        previous = stored["from"]
+    elif previous is None:
+        if stored.get("patch") and stored["patch"] != patch:
+            previous = stored["patch"]
+        else:
+            versions = get_versions()
+            previous = versions[versions.index(patch) + 1] if patch in versions[:-1] else None
+    if previous is None:
+        raise RuntimeError(f"no patch before {patch} to update from")
+
+    known = {}  # validators of the Meraki file the baseline was built from, for a conditional GET
+    if recheck or stored.get("patch") == previous:
+        baseline = stored["champions"]
+        known = stored.get("meraki") or {}
+    else:
+        say(f"No baseline for {previous} yet, hashing its ability cache once...")
+        # {} unless the cache was last used for (or just before) `previous`
+        baseline = {
+            cid: {"hash": champion_hash(entry["rows"]), "rows": entry["rows"], "source": entry["source"]}
+            for cid, entry in export_abilities(previous).items()
+        }
+
+    meraki, validators = _meraki_rows(stats, known)
+    roster = sorted(set(load_ddragon_champion_map(patch).values()))
+    old_entries = {cid: b for cid, b in baseline.items() if b.get("rows")}
+
+    carried, fetched, todo = {}, {}, []
+    for cid in roster:
+        entry = old_entries.get(cid)
+        if meraki is None:  # 304: Meraki's file is the one the baseline was built from
+            rows = entry["rows"] if entry and entry["source"] == MERAKI_SOURCE else None
+        else:
+            rows = meraki.get(cid)
+        if not rows:
+            todo.append(cid)  # not in Meraki's file: the usual lookup, which falls back to CDragon
+        elif entry and entry["hash"] == champion_hash(rows):
+            carried[cid] = (entry["rows"], entry["source"])
+        else:
+            fetched[cid] = (rows, MERAKI_SOURCE)
+    stats["champions"] = len(roster)
+    stats["unchanged"] = len(carried)
+    say(f"Patch {previous} → {patch}: {len(carried)} champions unchanged, {len(fetched)} changed, "
+        f"fetching {len(todo)} Meraki doesn't have...")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(get_champion_abilities, cid, patch, False): cid for cid in todo}
+        for done, future in enumerate(as_completed(futures), 1):
+            cid = futures[future]
+            try:
+                rows, source = future.result()
+            except Exception:
+                rows, source = [], None
+            if rows:
+                fetched[cid] = (rows, source)
+            say(f"  [{done:>3}/{len(todo)}] {cid}{'' if rows else ' (no data)'}")
+
+    for cid, (rows, _source) in fetched.items():
+        if cid in old_entries:
+            changes = cooldown_diff(old_entries[cid]["rows"], rows)
+            if changes:
+                stats["diff"][cid] = changes
+    stats["refetched"] = sorted(fetched)
+    stats["failed"] = sorted(set(todo) - fetched.keys())
+    put_many_cached_abilities(patch, {**carried, **fetched})
+    stats["final"] = meraki_covers_patch(validators, patch)
+    # failed champions are left out so the next update retries them
+    _write_baseline({
+        "patch": patch, "from": previous, "final": stats["final"], "meraki": validators,
+        "champions": {
+            cid: {"hash": champion_hash(rows), "rows": rows, "source": source}
+            for cid, (rows, source) in {**carried, **fetched}.items()
+        },
+    })
+
+    diff_path = os.path.join(DIFF_DIR, f"patch_diff_{previous}_{patch}.json")
+    champions_diff = stats["diff"]
+    if recheck:  # on top of what the provisional run(s) already found
+        try:
+            with open(diff_path, encoding="utf-8") as f:
+                champions_diff = {**json.load(f)["champions"], **stats["diff"]}
+        except (OSError, ValueError, KeyError):
+            pass
+    with open(diff_path, "w", encoding="utf-8") as f:
+        json.dump({"from": previous, "to": patch, "champions": champions_diff}, f, indent=1)
+
+    stats["seconds"] = time.perf_counter() - start
+    say(
+        f"Done in {stats['seconds']:.2f}s: {len(fetched)} replaced, {len(stats['diff'])} with cooldown changes, "
+        f"{stats['bytes'] / 1e6:.1f} MB" + (f", failed: {', '.join(stats['failed'])}" if stats["failed"] else "")
+    )
+    if not stats["final"]:
+        say(f"Meraki hasn't published data for {patch} yet; run --update-patch again in a few days to pick up its changes.")
+    return stats
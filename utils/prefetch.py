@@ -0,0 +1,100 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils import http_client
+from utils.abilities import (
+    parse_meraki, fetch_cdragon_data, parse_cdragon,
+    MERAKI_SOURCE, CDRAGON_SOURCE,
+)
+from utils.ability_cache import cached_champions, put_many_cached_abilities
+from utils.dd_champ_names import load_ddragon_champion_map
+
+MERAKI_ALL_URL = "https://cdn.merakianalytics.com/riot/lol/resources/latest/en-US/champions.json"
+DDRAGON_FULL_URL = "https://ddragon.leagueoflegends.com/cdn/{patch}/data/en_US/championFull.json"
+PREFETCH_WORKERS = 8
+
+
+def _get_json(url: str, stats: dict):
+    r = http_client.get(url, timeout=(3.05, 60))  # the all-champion files are several MB
+    stats["bytes"] += len(r.content)
+    if r.status_code != 200:
+        return None
+    return r.json()
+
+
+def prefetch_patch(patch: str, force: bool = False, workers: int = PREFETCH_WORKERS, progress=print) -> dict:
+    """
+    Pull a whole patch's ability data into the local ability cache.
+
+    1. Meraki's all-champion file covers (almost) everyone in one request.
+    2. Champions Meraki doesn't know yet come from DDragon's championFull.json
+       (names, one request) + per-champion CDragon files, fetched concurrently.
+
+    progress – callable taking one line of text, or None for silence
+    Returns stats: champions, meraki, cdragon, failed, skipped, bytes, seconds
+    """
+    say = progress or (lambda _msg: None)
+    start = time.perf_counter()
+    stats = {"champions": 0, "meraki": 0, "cdragon": 0, "failed": [], "skipped": 0, "bytes": 0, "seconds": 0.0}
+
+    roster = set(load_ddragon_champion_map(patch).values())
+    todo = roster if force else roster - cached_champions(patch)
+    stats["champions"] = len(roster)
+    stats["skipped"] = len(roster) - len(todo)
+    if not todo:
+        say(f"Patch {patch}: all {len(roster)} champions already cached.")
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+
+    say(f"Patch {patch}: prefetching {len(todo)} of {len(roster)} champions...")
+    items = {}
+
+    # 1. Meraki bulk file
+    meraki_all = _get_json(MERAKI_ALL_URL, stats) or {}
+    meraki_by_slug = {}
+    for key, champ in meraki_all.items():
+        meraki_by_slug[key] = champ
+        if isinstance(champ, dict) and champ.get("key"):
+            meraki_by_slug.setdefault(champ["key"], champ)
+
+    for slug in todo:
+        rows = parse_meraki(meraki_by_slug.get(slug))
+        if rows:
+            items[slug] = (rows, MERAKI_SOURCE)
+    stats["meraki"] = len(items)
+    say(f"  Meraki: {len(items)} champions from one file ({stats['bytes'] / 1e6:.1f} MB)")
+
+    # 2. CDragon for the rest
+    missing = sorted(todo - items.keys())
+    if missing:
+        dd_full = (_get_json(DDRAGON_FULL_URL.format(patch=patch), stats) or {}).get("data", {})
+
+        def load(slug):
+            dd_champ = dd_full.get(slug)
+            if not dd_champ:
+                return slug, []
+            cd_champ = fetch_cdragon_data(int(dd_champ["key"]), retries=True)
+            return slug, parse_cdragon(dd_champ, cd_champ) if cd_champ else []
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(load, slug) for slug in missing]
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    slug, rows = future.result()
+                except Exception:
+                    continue
+                if rows:
+                    items[slug] = (rows, CDRAGON_SOURCE)
+                    stats["cdragon"] += 1
+                say(f"  CDragon: [{done:>3}/{len(missing)}] {slug}{'' if rows else ' (no data)'}")
+
+    stats["failed"] = sorted(todo - items.keys())
+    put_many_cached_abilities(patch, items)
+
+    stats["seconds"] = time.perf_counter() - start
+    say(
+        f"Done: {len(items)} champions in {stats['seconds']:.2f}s "
+        f"({len(items) / stats['seconds']:.0f} champ/s, {stats['bytes'] / 1e6 / stats['seconds']:.1f} MB/s)"
+        + (f", failed: {', '.join(stats['failed'])}" if stats["failed"] else "")
+    )
+    return stats
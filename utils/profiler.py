@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# Off by default, and then stage() and cache_event() return straight away.
+# Turned on by --profile; events are kept in memory for the summary and the trace.
+_enabled = False
+_events = []          # {"name", "ts", "dur", "tid", "args"}, time in seconds since _origin
+_cache_events = []    # {"cache", "outcome", "ts", "tid"}
+_summarised = 0       # events before this index were already in a summary
+_summarised_cache = 0
+_lock = threading.Lock()
+_origin = time.perf_counter()
+
+
+class _Stage:
+    """ What stage() yields; set fields on .args to attach them to the span (bytes, source, ...) """
+    __slots__ = ("args",)
+
+    def __init__(self, args):
+        self.args = args
+
+
+class _NoopStage:
+    """ What stage() yields while profiling is off: a throwaway .args on every access, so callers can't share data """
+    __slots__ = ()
+
+    @property
+    def args(self) -> dict:
+        return {}
+
+
+_NOOP = _NoopStage()
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def stage(name: str, **args):
+    """ Time a block as one span, e.g. `with stage("meraki", champ=slug) as s: ...; s.args["rows"] = n` """
+    if not _enabled:
+        yield _NOOP
+        return
+    span = _Stage(dict(args))
+    start = time.perf_counter()
+    try:
+        yield span
+    except BaseException as e:
+        span.args["error"] = type(e).__name__
+        raise
+    finally:
+        end = time.perf_counter()
+        with _lock:
+            _events.append({
+                "name": name, "ts": start - _origin, "dur": end - start,
+                "tid": threading.get_ident(), "args": span.args,
+            })
+
+
+def cache_event(cache: str, outcome: str):
+    """ Record a cache lookup; outcome is "hit", "miss", or something more specific like "revalidated" """
+    if not _enabled:
+        return
+    with _lock:
+        _cache_events.append({
+            "cache": cache, "outcome": outcome, "ts": time.perf_counter() - _origin, "tid": threading.get_ident(),
+        })
+
+
+def reset():
+    global _summarised, _summarised_cache
+    with _lock:
+        _events.clear()
+        _cache_events.clear()
+        _summarised = _summarised_cache = 0
+
+
+def _fmt_bytes(n: int) -> str:
+    if n >= 1024 * 1024:
+        return f"{n / 1024 / 1024:.1f} MB"
+    if n >= 1024:
+        return f"{n / 1024:.1f} KB"
+    return f"{n} B"
+
+
+def take_summary() -> str:
+    """
+    Per-stage and per-cache table of everything recorded since the previous call:
+    count, total / max wall time, bytes transferred, errors; cache outcomes.
+    "" if nothing new was recorded.
+    """
+    global _summarised, _summarised_cache
+    with _lock:
+        events = _events[_summarised:]
+        cache_events = _cache_events[_summarised_cache:]
+        _summarised, _summarised_cache = len(_events), len(_cache_events)
+
+    if not events and not cache_events:
+        return ""
+
+    stages = {}
+    for e in events:
+        s = stages.setdefault(e["name"], {"count": 0, "total": 0.0, "max": 0.0, "bytes": 0, "errors": 0})
+        s["count"] += 1
+        s["total"] += e["dur"]
+        s["max"] = max(s["max"], e["dur"])
+        s["bytes"] += e["args"].get("bytes", 0)
+        s["errors"] += "error" in e["args"]
+
+    lines = []
+    if stages:
+        width = max(len(name) for name in stages)
+        lines.append(f"{'stage':<{width}}  {'calls':>5}  {'total':>9}  {'max':>9}  {'bytes':>9}")
+        for name, s in sorted(stages.items(), key=lambda kv: -kv[1]["total"]):
+            lines.append(
+                f"{name:<{width}}  {s['count']:>5}  {s['total'] * 1e3:>7.1f}ms  {s['max'] * 1e3:>7.1f}ms  "
+                f"{_fmt_bytes(s['bytes']) if s['bytes'] else '-':>9}"
+                + (f"  {s['errors']} failed" if s["errors"] else "")
+            )
+    if cache_events:
+        caches = {}
+        for e in cache_events:
+            outcomes = caches.setdefault(e["cache"], {})
+            outcomes[e["outcome"]] = outcomes.get(e["outcome"], 0) + 1
+        lines.append("")
+        for cache, outcomes in caches.items():
+            lines.append(f"cache {cache}: " + ", ".join(f"{n} {outcome}" for outcome, n in outcomes.items()))
+    return "\n".join(lines)
+
+
+def export_chrome_trace(path: str):
+    """
+    Write everything recorded as a Chrome trace (chrome://tracing, Perfetto, speedscope):
+    stages are complete ("X") events, cache lookups instant ("i") events.
+    """
+    pid = os.getpid()
+    with _lock:
+        trace = [
+            {"name": e["name"], "ph": "X", "ts": e["ts"] * 1e6, "dur": e["dur"] * 1e6,
+             "pid": pid, "tid": e["tid"], "args": e["args"]}
+            for e in _events
+        ] + [
+            {"name": f"cache {e['cache']} {e['outcome']}", "ph": "i", "s": "t", "ts": e["ts"] * 1e6,
+             "pid": pid, "tid": e["tid"], "args": {"cache": e["cache"], "outcome": e["outcome"]}}
+            for e in _cache_events
+        ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f, default=str)
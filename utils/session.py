@@ -0,0 +1,93 @@
+"""
+One lookup session for the life of the process. The patch, its champion registry
+and fuzzy name index, the HTTP pool, the ability cache and the fetch workers are
+set up once and shared by every query, so only the first query pays for them.
+
+A background thread re-checks versions.json every PATCH_REFRESH_INTERVAL and,
+when a new patch is out, loads its registry before swapping it in; queries keep
+using the old patch until then instead of waiting on the reload.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import http_client, profiler
+from utils.abilities import fetch_latest_patch
+from utils.ability_cache import preload_ability_cache
+from utils.champion_registry import load_champion_registry, ChampionRegistry
+from utils.dd_champ_names import get_name_index
+from utils.patch import refresh_versions
+
+PATCH_REFRESH_INTERVAL = 15 * 60  # seconds; patches drop every two weeks, but a long session can span one
+LOOKUP_WORKERS = 5
+
+
+class LookupSession:
+    def __init__(self, workers: int = LOOKUP_WORKERS, refresh_interval: float = PATCH_REFRESH_INTERVAL):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lookup")
+        self.refresh_interval = refresh_interval
+        self.patch_changed = None  # (old, new) after a background switch, until take_patch_change()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._use(fetch_latest_patch())
+
+    def _use(self, patch: str):
+        with profiler.stage("load patch", patch=patch):
+            registry = load_champion_registry(patch)
+            get_name_index(registry.name_map)  # built now rather than by the first query
+        with self._lock:
+            self._patch, self._registry = patch, registry
+
+    def current(self) -> tuple[str, ChampionRegistry]:
+        """ (patch, registry), always from the same patch even mid-switch """
+        with self._lock:
+            return self._patch, self._registry
+
+    @property
+    def patch(self) -> str:
+        return self.current()[0]
+
+    @property
+    def name_map(self) -> dict[str, str]:
+        return self.current()[1].name_map
+
+    def take_patch_change(self) -> tuple[str, str] | None:
+        """ The (old, new) patch switch since the last call, if any """
+        with self._lock:
+            change, self.patch_changed = self.patch_changed, None
+        return change
+
+    def refresh(self) -> bool:
+        """ Check versions.json now; switch to a new patch if there is one. Returns whether it switched """
+        latest = refresh_versions()[0]
+        old = self.patch
+        if latest == old:
+            return False
+        self._use(latest)
+        preload_ability_cache(latest)
+        with self._lock:
+            self.patch_changed = (old, latest)
+        return True
+
+    def start(self):
+        """ Warm the HTTP pool and ability cache in the background, then keep the patch fresh """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="session-refresh", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        offline = http_client.is_offline()
+        if not offline:
+            http_client.get_session(retries=False)  # imports requests and builds the lookup pool off the query path
+        preload_ability_cache(self.patch)
+        if offline:  # snapshot metadata is pinned; there is nothing to refresh
+            return
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                pass  # network hiccup: keep the current patch and try again next interval
+
+    def close(self):
+        self._stop.set()
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,86 @@
+import os
+import glob
+import json
+import time
+import zipfile
+
+from utils import http_client
+from utils.patch import get_versions, get_release_dates, get_effective_patch, pin_patch_metadata
+from utils.champion_registry import load_champion_registry, register_registry, ChampionRegistry
+from utils.ability_cache import export_abilities, restore_abilities
+from utils.matchup_store import load_matchup_store, register_matchup_store, MatchupStore
+
+SNAPSHOT_DIR = "./snapshot"
+SNAPSHOT_FORMAT = 1
+
+
+def default_snapshot_path(patch: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"lch_snapshot_{patch}.zip")
+
+
+def latest_snapshot_path() -> str | None:
+    paths = glob.glob(os.path.join(SNAPSHOT_DIR, "lch_snapshot_*.zip"))
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def export_snapshot(path: str | None = None) -> str:
+    """
+    Write everything offline mode needs into one zip:
+      manifest.json   format version, patches, creation time
+      patch.json      versions.json + release dates
+      registry/<patch>.json for the latest and the effective patch
+      abilities.json  the latest patch's ability cache
+      matchups.bin    the effective patch's matchup store
+    Only what is cached locally is exported; run --prefetch / --crawl first for full coverage.
+    """
+    versions = get_versions()
+    latest, effective = versions[0], get_effective_patch()
+    path = path or default_snapshot_path(latest)
+
+    abilities = export_abilities(latest)
+    store = load_matchup_store(effective)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with zipfile.ZipFile(path + ".tmp", "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("manifest.json", json.dumps({
+            "format": SNAPSHOT_FORMAT,
+            "latest_patch": latest,
+            "effective_patch": effective,
+            "created_at": time.time(),
+            "champions_with_abilities": len(abilities),
+            "matchup_rows": len(store),
+        }, indent=2))
+        zf.writestr("patch.json", json.dumps({"versions": versions, "release_dates": get_release_dates()}))
+        for patch in dict.fromkeys((latest, effective)):
+            zf.writestr(f"registry/{patch}.json", json.dumps(load_champion_registry(patch).to_json(), ensure_ascii=False))
+        zf.writestr("abilities.json", json.dumps(abilities, ensure_ascii=False))
+        zf.writestr("matchups.bin", store.to_bytes(), compress_type=zipfile.ZIP_STORED)  # already zlib'd
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def load_snapshot(path: str, offline: bool = True) -> dict:
+    """
+    Seed the patch metadata, champion registries, ability cache and matchup store
+    from a snapshot so lookups are answered locally, and (by default) switch the
+    HTTP layer to offline mode so nothing else can reach the network.
+    Returns the manifest.
+    """
+    with zipfile.ZipFile(path) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise RuntimeError(f"{path}: unsupported snapshot format {manifest.get('format')}")
+
+        patch_meta = json.loads(zf.read("patch.json"))
+        pin_patch_metadata(patch_meta["versions"], patch_meta["release_dates"])
+
+        for name in zf.namelist():
+            if name.startswith("registry/"):
+                register_registry(ChampionRegistry.from_json(json.loads(zf.read(name))))
+
+        restore_abilities(manifest["latest_patch"], json.loads(zf.read("abilities.json")))
+        register_matchup_store(MatchupStore.from_bytes(zf.read("matchups.bin")))
+
+    if offline:
+        http_client.set_offline(True)
+    return manifest